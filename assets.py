@@ -27,7 +27,14 @@ PLAYER_SPEED = 5
 # Asset loading
 import os
 import sys
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 import pygame
+import gamelog
+
+log = gamelog.get_logger("render")
 
 
 def resource_path(relative_path):
@@ -38,20 +45,224 @@ def resource_path(relative_path):
         base_path = os.path.abspath(".")
     return os.path.join(base_path, relative_path)
 
-def load_spaceship_image(size):
-    img_path = resource_path("spaceship.png")
-    if not os.path.exists(img_path):
-        print(f"Could not find {img_path}. Make sure the image is in the project folder or bundled with the executable.")
-        return None
-    try:
-        img = pygame.image.load(img_path).convert_alpha()
-        img = pygame.transform.scale(img, (size, size))
+# Asset manifest: name -> file relative to resource_path, decoded by the AssetManager
+ASSET_MANIFEST = {
+    "spaceship": "spaceship.png",
+}
+ASSET_WORKERS = 2
+_FAILED = object()  # Cached in place of an asset that failed to load, so it is reported once
+
+
+class AssetManager:
+    """
+    Loads manifest images on a thread pool. Workers decode and scale; the display-format
+    conversion happens on the thread that calls get(), since it needs the display surface.
+    Scaled variants are cached per (asset, size); request() returns a readiness future.
+    """
+    def __init__(self, manifest=None, workers=ASSET_WORKERS):
+        self.manifest = dict(ASSET_MANIFEST if manifest is None else manifest)
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="assets")
+        self._lock = threading.Lock()
+        self._decoded = {}    # name -> Future of the decoded Surface
+        self._variants = {}   # (name, size) -> Future of the scaled Surface
+        self._converted = {}  # (name, size) -> display-format Surface, or _FAILED
+
+    def _decode(self, name):
+        img_path = resource_path(self.manifest[name])
+        if not os.path.exists(img_path):
+            raise FileNotFoundError(f"Could not find {img_path}. Make sure the image is in the project folder or bundled with the executable.")
+        return pygame.image.load(img_path)
+
+    def _scale(self, name, size):
+        img = self._decoded[name].result()
+        return img if size is None else pygame.transform.scale(img, size)
+
+    def preload(self, names=None):
+        """
+        Starts decoding the named assets (default: the whole manifest); returns their futures.
+        """
+        futures = []
+        with self._lock:
+            for name in (self.manifest if names is None else names):
+                future = self._decoded.get(name)
+                if future is None:
+                    future = self._decoded[name] = self._pool.submit(self._decode, name)
+                futures.append(future)
+        return futures
+
+    def request(self, name, size=None):
+        """
+        Future for the asset scaled to size (w, h), or unscaled for None.
+        """
+        key = (name, None if size is None else tuple(size))
+        self.preload((name,))
+        with self._lock:
+            future = self._variants.get(key)
+            if future is None:
+                future = self._variants[key] = self._pool.submit(self._scale, *key)
+        return future
+
+    def ready(self, name, size=None):
+        return self.request(name, size).done()
+
+    def get(self, name, size=None, wait=True):
+        """
+        The display-format Surface, or None if it failed to load or (with wait=False) is not ready yet.
+        """
+        key = (name, None if size is None else tuple(size))
+        img = self._converted.get(key)
+        if img is _FAILED:
+            return None
+        if img is not None:
+            return img
+        future = self.request(name, size)
+        if not wait and not future.done():
+            return None
+        try:
+            img = future.result()
+        except Exception as e:
+            log.warning("Error loading %s: %s", self.manifest.get(name, name), e)
+            self._converted[key] = _FAILED
+            return None
+        if pygame.display.get_surface() is None:
+            return img  # Not cached: converted on a later call, once there is a display
+        img = img.convert_alpha()
+        self._converted[key] = img
         return img
-    except Exception as e:
-        print(f"Error loading {img_path}: {e}")
-        return None
+
+    def shutdown(self):
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+
+_asset_manager = None
+
+
+def get_asset_manager():
+    global _asset_manager
+    if _asset_manager is None:
+        _asset_manager = AssetManager()
+    return _asset_manager
+
+
+def load_spaceship_image(size):
+    return get_asset_manager().get("spaceship", (size, size))
+
+
+# Rotated sprites
+ROTATION_STEP = 2  # Degrees between cached rotations
+
+
+class RotationCache:
+    """
+    Rotated copies of one sprite at a fixed angular step, filled lazily (or all at once with
+    prerender()), each with a matching soft drop shadow. Angles are snapped to the nearest step.
+    """
+    def __init__(self, image, step=ROTATION_STEP, shadow=True):
+        self.image = image
+        self.step = step
+        self.shadow = shadow
+        self.count = max(1, round(360 / step))
+        self._frames = [None] * self.count
+
+    def _index(self, angle):
+        return int(round(angle / (360 / self.count))) % self.count
+
+    def _build(self, i):
+        rotated = pygame.transform.rotate(self.image, i * 360 / self.count)
+        shadow = None
+        if self.shadow:
+            shadow = pygame.Surface(rotated.get_size(), pygame.SRCALPHA)
+            pygame.draw.ellipse(shadow, (0,0,0,80), shadow.get_rect().move(0,8))
+        return rotated, shadow
+
+    def get(self, angle):
+        """
+        Returns (rotated sprite, shadow or None) for the angle in degrees. Surfaces are shared.
+        """
+        i = self._index(angle)
+        frame = self._frames[i]
+        if frame is None:
+            frame = self._build(i)
+            self._frames[i] = frame
+        return frame
+
+    def prerender(self):
+        for i in range(self.count):
+            if self._frames[i] is None:
+                self._frames[i] = self._build(i)
+
+
+_rotation_caches = {}
+
+
+def get_rotation_cache(name, image, step=ROTATION_STEP, shadow=True):
+    """
+    Shared RotationCache per (sprite name, sprite size, step), e.g. one per loaded ship size.
+    """
+    key = (name, image.get_size(), step, shadow)
+    cache = _rotation_caches.get(key)
+    if cache is None:
+        cache = RotationCache(image, step, shadow)
+        _rotation_caches[key] = cache
+    return cache
+
+
+# Fonts and rendered text
+# Fonts are loaded from files through resource_path, never SysFont: SysFont scans every
+# installed font on first use. FONT_FILES maps a face name to a bundled TTF; faces without
+# a bundled file use pygame's built-in default font, which is what SysFont fell back to
+# for them anyway. One font object per (face, size, bold).
+FONT_DIR = "fonts"
+# UI text uses Lato (SIL Open Font License, see fonts/OFL.txt) in place of Segoe UI, which
+# only Windows has; bold is synthesized by pygame
+FONT_FILES = {"Segoe UI": "Lato-Regular.ttf"}
+_fonts = {}
+font_stats = {"loaded": 0, "seconds": 0.0}
+
+# Rendered text surfaces keyed by (text, font key, color, antialias), LRU-bounded.
+TEXT_CACHE_SIZE = 512
+_text_cache = OrderedDict()
+text_cache_stats = {"hits": 0, "misses": 0}
+
+
+def get_font(size, name=None, bold=False):
+    key = (name, size, bold)
+    font = _fonts.get(key)
+    if font is None:
+        start = time.perf_counter()
+        path = FONT_FILES.get(name)
+        path = resource_path(os.path.join(FONT_DIR, path)) if path else None
+        if path is not None and not os.path.exists(path):
+            log.warning("Could not find font %s, using the default font", path)
+            path = None
+        font = pygame.font.Font(path, size)
+        if bold:
+            font.set_bold(True)
+        _fonts[key] = font
+        font_stats["loaded"] += 1
+        font_stats["seconds"] += time.perf_counter() - start
+    return font
+
+
+def render_text(text, size, color, name=None, bold=False, antialias=True):
+    """
+    Returns a cached surface for text. The surface is shared: blit it, never draw on it.
+    """
+    key = (text, name, size, bold, tuple(color), antialias)
+    surf = _text_cache.get(key)
+    if surf is not None:
+        _text_cache.move_to_end(key)
+        text_cache_stats["hits"] += 1
+        return surf
+    text_cache_stats["misses"] += 1
+    surf = get_font(size, name, bold).render(text, antialias, color)
+    _text_cache[key] = surf
+    if len(_text_cache) > TEXT_CACHE_SIZE:
+        _text_cache.popitem(last=False)
+    return surf
 
 
-# Fonts (example, can be loaded as needed)
-def get_font(size):
-    return pygame.font.SysFont(None, size)
+def clear_text_cache():
+    _text_cache.clear()
+    text_cache_stats["hits"] = 0
+    text_cache_stats["misses"] = 0
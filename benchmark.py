@@ -0,0 +1,253 @@
+"""
+Rendering and simulation micro-benchmarks, run offscreen with the SDL dummy video driver.
+
+    python benchmark.py                       # run all, write benchmark-results.json
+    python benchmark.py -k inventory -n 200   # only names containing "inventory"
+    python benchmark.py --compare old.json    # flag regressions against an earlier run
+
+Latency is wall time per call. Allocations are Python-heap bytes per call measured with
+tracemalloc in a separate pass: peak transient bytes and bytes retained after the call.
+SDL surface memory is allocated in C and is not included.
+"""
+
+import os
+import sys
+import json
+import time
+import platform
+import argparse
+import subprocess
+import tracemalloc
+
+os.environ["SDL_VIDEODRIVER"] = "dummy"
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import pygame
+from profiler import percentile
+
+REGRESSION_THRESHOLD = 1.25  # p50 ratio above which --compare reports a regression
+
+
+def _setup():
+    """
+    Builds the shared fixtures once: a dummy display, a Game advanced a little, and inputs for each benchmark.
+    """
+    from assets import WIDTH, HEIGHT
+    pygame.init()
+    screen = pygame.display.set_mode((WIDTH, HEIGHT))
+    from gameloop import Game, Inputs
+    game = Game(seed=1)
+    for _ in range(10):
+        game.step(Inputs(), 1 / 60)
+    game.render(screen)  # Warm sprite, font and text caches
+    return screen, game
+
+
+def _benchmarks(screen, game):
+    import ui
+    import copy
+    from assets import WIDTH, HEIGHT, WHITE, SUN_COLOR, SUN_POS, SUN_RADIUS
+    from planets import PLANETS, PlanetTable, update_planet_positions, get_planet_positions
+    from universe import StarSystem
+    import entities
+    import particles
+    import numpy as np
+
+    cam_x, cam_y = game.camera()
+    stars = game.starfield.visible(cam_x, cam_y, WIDTH, HEIGHT)
+    # Camera on the sun, so the glow layers are drawn rather than culled
+    sun_cam = (SUN_POS[0] - WIDTH // 2, SUN_POS[1] - HEIGHT // 2)
+    sun_stars = game.starfield.visible(*sun_cam, WIDTH, HEIGHT)
+    # Snapshots as published by the simulation thread, one with the map open
+    snap = game.snapshot()
+    game.show_map = True
+    map_snap = game.snapshot()
+    game.show_map = False
+    planets = game.planets
+    earth = planets[game.planet_table.index["Earth"]]
+    earth_cam = (int(earth.pos[0]) - WIDTH // 2, int(earth.pos[1]) - HEIGHT // 2)
+    big_inventory = {f"Material {i:05d}": i % 7 + 1 for i in range(10000)}
+    planet_dicts = copy.deepcopy(PLANETS)
+    table = PlanetTable(PLANETS)
+    tick = [0.0]
+
+    # A crowded store: 500 traders and 4000 shots around Earth, all on screen
+    crowd = entities.EntityStore()
+    crowd_rng = np.random.default_rng(0)
+    xs, ys = table.positions_at(0.0, SUN_POS)
+    entities.spawn_traders(crowd, 500, xs, ys, table.size, 0.0, crowd_rng)
+    for i in range(4000):
+        angle = crowd_rng.uniform(0, 360)
+        crowd.spawn(earth.pos[0] + crowd_rng.uniform(-600, 600), earth.pos[1] + crowd_rng.uniform(-300, 300),
+                    angle=angle, sprite=entities.SPRITE_SHOT, life=1e9)
+    crowd_sprites = ui.build_entity_sprites(game.ship_img)
+
+    def entities_step():
+        tick[0] += 1 / 60
+        xs, ys = table.positions_at(tick[0], SUN_POS)
+        entities.expire(crowd, 1 / 60)
+        entities.steer_traders(crowd, xs, ys, table.size, tick[0], 1 / 60, crowd_rng)
+        entities.move(crowd, 1 / 60)
+        entities.follow_orbits(crowd, xs, ys, tick[0])
+
+    # A full particle pool on screen, re-emitted as it expires
+    pool = particles.ParticlePool(seed=0)
+    pool.emit(pool.capacity, *earth.pos, 0.0, 6.3, 200, 2.0, particles.SPARK, jitter=300)
+
+    def particles_update():
+        # Refill a sixtieth of the pool per call, so every particle stays alive
+        pool.emit(pool.capacity // 60, *earth.pos, 0.0, 6.3, 200, 2.0, particles.SPARK, jitter=300)
+        pool.update(1 / 60)
+
+    sectors = [0]
+
+    def generate_system():
+        sectors[0] += 1
+        StarSystem(0, (sectors[0], 1))
+
+    def table_positions():
+        tick[0] += 1 / 60
+        table.positions_at(tick[0], SUN_POS)
+
+    return {
+        "draw_game_background": lambda: ui.draw_game_background(screen, stars, cam_x, cam_y, WIDTH, HEIGHT, SUN_COLOR, SUN_POS, SUN_RADIUS, WHITE),
+        "draw_game_background_sun": lambda: ui.draw_game_background(screen, sun_stars, *sun_cam, WIDTH, HEIGHT, SUN_COLOR, SUN_POS, SUN_RADIUS, WHITE),
+        "draw_planets": lambda: ui.draw_planets(screen, planets, game.planet_sprites, *earth_cam, WIDTH, HEIGHT),
+        "map_view": lambda: game._draw_map(screen, map_snap),
+        "draw_inventory_10k": lambda: ui.draw_inventory(screen, big_inventory, WIDTH, HEIGHT, 5000),
+        "draw_health_fuel_bars": lambda: ui.draw_health_fuel_bars(screen, 73, 100, 41, 100),
+        "hud_update": lambda: game._update_hud(screen, [], snap),
+        "draw_tech_tree": lambda: ui.draw_tech_tree(screen, WIDTH, HEIGHT, {}, game.state.tech_upgrades),
+        "update_planet_positions": lambda: update_planet_positions(planet_dicts, 1),
+        "get_planet_positions": lambda: get_planet_positions(planet_dicts, SUN_POS),
+        "planet_table_positions": table_positions,
+        "planet_table_view": lambda: table.view(SUN_POS),
+        "generate_system": generate_system,
+        "entities_step": entities_step,
+        "entities_draw": lambda: entities.draw(crowd, screen, crowd_sprites, *earth_cam, WIDTH, HEIGHT),
+        "particles_update": particles_update,
+        "particles_draw": lambda: pool.draw(screen, *earth_cam),
+        "game_snapshot": lambda: game.snapshot(snap),
+        "game_render": lambda: game.render(screen, snap),
+    }
+
+
+def _time(fn, calls, warmup):
+    for _ in range(warmup):
+        fn()
+    samples = []
+    clock = time.perf_counter
+    for _ in range(calls):
+        start = clock()
+        fn()
+        samples.append((clock() - start) * 1e6)
+    samples.sort()
+    return {
+        "calls": calls,
+        "mean_us": sum(samples) / calls,
+        "p50_us": percentile(samples, 50),
+        "p95_us": percentile(samples, 95),
+        "min_us": samples[0],
+    }
+
+
+def _allocations(fn, calls):
+    """
+    peak_bytes: mean transient Python-heap growth within one call (temporaries included).
+    retained_bytes: mean heap growth left behind per call (leaks, caches filling up).
+    """
+    tracemalloc.start()
+    try:
+        fn()
+        start, _ = tracemalloc.get_traced_memory()
+        peaks = 0
+        for _ in range(calls):
+            base, _ = tracemalloc.get_traced_memory()
+            tracemalloc.reset_peak()
+            fn()
+            _, peak = tracemalloc.get_traced_memory()
+            peaks += peak - base
+        end, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return {"peak_bytes": peaks / calls, "retained_bytes": max(0, end - start) / calls}
+
+
+def run(calls=300, warmup=20, alloc_calls=20, name_filter=None):
+    screen, game = _setup()
+    results = {}
+    for name, fn in _benchmarks(screen, game).items():
+        if name_filter and name_filter not in name:
+            continue
+        result = _time(fn, calls, warmup)
+        result.update(_allocations(fn, alloc_calls))
+        results[name] = result
+    pygame.quit()
+    return results
+
+
+def _commit():
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, timeout=5)
+        return out.stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def compare(results, baseline, threshold=REGRESSION_THRESHOLD):
+    """
+    Returns [(name, old p50, new p50, ratio)] for benchmarks slower than threshold x baseline.
+    """
+    regressions = []
+    for name, new in results.items():
+        old = baseline.get(name)
+        if not old or old["p50_us"] <= 0:
+            continue
+        ratio = new["p50_us"] / old["p50_us"]
+        if ratio > threshold:
+            regressions.append((name, old["p50_us"], new["p50_us"], ratio))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run rendering/simulation benchmarks offscreen.")
+    parser.add_argument("-n", "--calls", type=int, default=300)
+    parser.add_argument("--warmup", type=int, default=20)
+    parser.add_argument("-k", dest="name_filter", help="only run benchmarks whose name contains this")
+    parser.add_argument("-o", "--output", default="benchmark-results.json")
+    parser.add_argument("--compare", help="earlier results JSON to compare against")
+    parser.add_argument("--threshold", type=float, default=REGRESSION_THRESHOLD)
+    args = parser.parse_args(argv)
+
+    results = run(args.calls, args.warmup, name_filter=args.name_filter)
+    report = {
+        "meta": {
+            "commit": _commit(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "pygame": pygame.version.ver,
+            "platform": platform.platform(),
+        },
+        "results": results,
+    }
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+
+    print(f"{'benchmark':<26} {'p50 us':>10} {'p95 us':>10} {'peak B':>10} {'retained B':>11}")
+    for name, r in results.items():
+        print(f"{name:<26} {r['p50_us']:>10.1f} {r['p95_us']:>10.1f} {r['peak_bytes']:>10.0f} {r['retained_bytes']:>11.1f}")
+    print(f"Results written to {args.output}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)["results"]
+        regressions = compare(results, baseline, args.threshold)
+        for name, old, new, ratio in regressions:
+            print(f"REGRESSION {name}: p50 {old:.1f}us -> {new:.1f}us ({ratio:.2f}x)")
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
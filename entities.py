@@ -0,0 +1,310 @@
+"""
+Array-backed entity store for everything that moves besides the player ship: NPC traders and
+projectiles. Components are NumPy columns indexed by entity slot, and the systems below run
+over whole columns per tick, so hundreds of traders and thousands of shots cost a handful of
+array operations instead of a Python loop each.
+"""
+
+import math
+import numpy as np
+import pygame
+
+# Factions
+FACTION_PLAYER = 0
+FACTION_TRADER = 1
+
+# Sprite ids index the sprite list passed to draw(); -1 is not drawn
+SPRITE_NONE = -1
+SPRITE_TRADER = 0
+SPRITE_SHOT = 1
+
+NONE = -1  # No anchor / no target
+
+TRADER_SPEED = 400.0         # World units per second between planets
+TRADER_DWELL = (4.0, 14.0)   # Seconds orbiting a planet before flying on
+TRADER_ORBIT = (60.0, 180.0) # Orbit height above the planet surface
+SHOT_SPEED = 900.0
+SHOT_LIFE = 1.5
+DIRTY_LIMIT = 64  # Beyond this many drawn entities, draw() reports the whole screen as dirty
+
+
+def heading(dx, dy):
+    # Direction to ship angle in degrees (pygame rotation convention, 0 = up); works on arrays
+    return np.degrees(np.arctan2(-dx, -dy))
+
+
+class EntityStore:
+    """
+    Fixed-capacity component columns; an entity is a slot index. Free slots are a stack, so
+    spawn and despawn are O(1) and nothing is allocated per entity.
+    """
+    def __init__(self, capacity=8192):
+        self.capacity = capacity
+        self.alive = np.zeros(capacity, dtype=bool)
+        # Transform and motion; prev_* is the last step's position, for render interpolation
+        self.x = np.zeros(capacity)
+        self.y = np.zeros(capacity)
+        self.prev_x = np.zeros(capacity)
+        self.prev_y = np.zeros(capacity)
+        self.vx = np.zeros(capacity)
+        self.vy = np.zeros(capacity)
+        self.angle = np.zeros(capacity)  # Degrees
+        self.sprite = np.full(capacity, SPRITE_NONE, dtype=np.int16)
+        self.faction = np.zeros(capacity, dtype=np.int8)
+        self.life = np.full(capacity, np.inf)  # Seconds left; inf never expires
+        # Orbit-following: anchor body index, orbit radius, phase at sim time 0, angular speed (rad/s)
+        self.anchor = np.full(capacity, NONE, dtype=np.int32)
+        self.orbit_r = np.zeros(capacity)
+        self.orbit_phase = np.zeros(capacity)
+        self.orbit_speed = np.zeros(capacity)
+        # Trader AI: destination body while flying, seconds left while orbiting
+        self.target = np.full(capacity, NONE, dtype=np.int32)
+        self.timer = np.zeros(capacity)
+        self.count = 0
+        # Slots are handed out lowest first and freed slots are reused first, so systems only
+        # need to look at the first `used` slots
+        self.used = 0
+        self._free = list(range(capacity - 1, -1, -1))
+        self._scratch = np.zeros(capacity)
+
+    def __len__(self):
+        return self.count
+
+    def spawn(self, x, y, vx=0.0, vy=0.0, angle=0.0, sprite=SPRITE_NONE, faction=FACTION_PLAYER, life=math.inf):
+        """
+        Returns the new entity's slot, or -1 if the store is full.
+        """
+        if not self._free:
+            return NONE
+        i = self._free.pop()
+        self.alive[i] = True
+        self.x[i] = self.prev_x[i] = x
+        self.y[i] = self.prev_y[i] = y
+        self.vx[i] = vx
+        self.vy[i] = vy
+        self.angle[i] = angle
+        self.sprite[i] = sprite
+        self.faction[i] = faction
+        self.life[i] = life
+        self.anchor[i] = NONE
+        self.target[i] = NONE
+        self.timer[i] = 0.0
+        self.count += 1
+        if i >= self.used:
+            self.used = i + 1
+        return i
+
+    def despawn(self, slots):
+        """
+        Frees one slot or an array of slots.
+        """
+        slots = np.atleast_1d(slots)
+        slots = slots[self.alive[slots]]
+        if not len(slots):
+            return
+        self.alive[slots] = False
+        self.sprite[slots] = SPRITE_NONE
+        self.vx[slots] = 0.0
+        self.vy[slots] = 0.0
+        self.anchor[slots] = NONE
+        self.target[slots] = NONE
+        self.life[slots] = np.inf
+        self._free.extend(slots.tolist())
+        self.count -= len(slots)
+
+    def clear(self):
+        self.despawn(np.flatnonzero(self.alive[:self.used]))
+        self.used = 0
+        self._free = list(range(self.capacity - 1, -1, -1))
+
+    def anchor_to(self, i, body, radius, phase, speed, sim_time):
+        # Starts orbiting body at the given phase now; orbit_phase is stored relative to time 0
+        self.anchor[i] = body
+        self.orbit_r[i] = radius
+        self.orbit_speed[i] = speed
+        self.orbit_phase[i] = phase - speed * sim_time
+        self.vx[i] = self.vy[i] = 0.0
+
+
+_FRAME_COLUMNS = ("x", "y", "prev_x", "prev_y", "angle", "sprite")
+
+
+class EntityFrame:
+    """
+    Preallocated copy of the columns draw() needs, refilled by copy_from(), so another thread
+    can draw one step while the store moves on.
+    """
+    __slots__ = ("used",) + _FRAME_COLUMNS
+
+    def __init__(self, capacity):
+        self.used = 0
+        for name in _FRAME_COLUMNS:
+            setattr(self, name, np.zeros(capacity))
+        self.sprite = np.full(capacity, SPRITE_NONE, dtype=np.int16)
+
+    def copy_from(self, store):
+        n = self.used = store.used
+        for name in _FRAME_COLUMNS:
+            np.copyto(getattr(self, name)[:n], getattr(store, name)[:n])
+
+
+# --- SYSTEMS ---
+def expire(store, dt):
+    """
+    Counts lifetimes down and despawns entities whose time ran out.
+    """
+    n = store.used
+    life = store.life[:n]
+    life -= dt
+    dead = np.flatnonzero(store.alive[:n] & (life <= 0))
+    if len(dead):
+        store.despawn(dead)
+
+
+def move(store, dt):
+    """
+    Integrates velocity for every slot; orbiting and free slots have zero velocity.
+    """
+    n = store.used
+    x, y = store.x[:n], store.y[:n]
+    np.copyto(store.prev_x[:n], x)
+    np.copyto(store.prev_y[:n], y)
+    scratch = store._scratch[:n]
+    np.multiply(store.vx[:n], dt, out=scratch)
+    x += scratch
+    np.multiply(store.vy[:n], dt, out=scratch)
+    y += scratch
+
+
+def follow_orbits(store, body_x, body_y, sim_time):
+    """
+    Places anchored entities on their orbits around the bodies at body_x/body_y (the planet
+    table's position columns), facing along the orbit.
+    """
+    idx = np.flatnonzero(store.anchor[:store.used] >= 0)
+    if not len(idx):
+        return
+    body = store.anchor[idx]
+    speed = store.orbit_speed[idx]
+    phase = store.orbit_phase[idx] + speed * sim_time
+    cos, sin = np.cos(phase), np.sin(phase)
+    r = store.orbit_r[idx]
+    store.x[idx] = body_x[body] + r * cos
+    store.y[idx] = body_y[body] + r * sin
+    direction = np.sign(speed)
+    store.angle[idx] = heading(-sin * direction, cos * direction)
+
+
+def steer_traders(store, body_x, body_y, body_r, sim_time, dt, rng):
+    """
+    Trader AI: orbit a planet for a while, fly to another one, enter its orbit on arrival.
+    """
+    used = store.used
+    traders = store.alive[:used] & (store.faction[:used] == FACTION_TRADER)
+    anchor = store.anchor[:used]
+    n = len(body_x)
+    # Departures: orbiting traders whose dwell time is up pick a different planet
+    timer = store.timer[:used]
+    timer -= dt
+    leaving = np.flatnonzero(traders & (anchor >= 0) & (timer <= 0))
+    if len(leaving) and n > 1:
+        home = store.anchor[leaving]
+        store.target[leaving] = (home + rng.integers(1, n, len(leaving))) % n
+        store.orbit_r[leaving] -= body_r[home]  # Keep only the height, reused at the next planet
+        store.anchor[leaving] = NONE
+    flying = np.flatnonzero(traders & (anchor < 0) & (store.target[:used] >= 0))
+    if not len(flying):
+        return
+    target = store.target[flying]
+    dx = body_x[target] - store.x[flying]
+    dy = body_y[target] - store.y[flying]
+    dist = np.hypot(dx, dy)
+    # Arrivals: close enough to the target's orbit height
+    orbit_r = body_r[target] + store.orbit_r[flying]
+    arrived = dist <= orbit_r + TRADER_SPEED * dt
+    if arrived.any():
+        slots = flying[arrived]
+        phase = np.arctan2(-dy[arrived], -dx[arrived])
+        speed = store.orbit_speed[slots]
+        store.anchor[slots] = target[arrived]
+        store.orbit_r[slots] = orbit_r[arrived]
+        store.orbit_phase[slots] = phase - speed * sim_time
+        store.vx[slots] = store.vy[slots] = 0.0
+        store.target[slots] = NONE
+        store.timer[slots] = rng.uniform(*TRADER_DWELL, len(slots))
+        keep = ~arrived
+        flying, dx, dy, dist = flying[keep], dx[keep], dy[keep], dist[keep]
+    if len(flying):
+        dist = np.maximum(dist, 1e-6)
+        store.vx[flying] = dx / dist * TRADER_SPEED
+        store.vy[flying] = dy / dist * TRADER_SPEED
+        store.angle[flying] = heading(dx, dy)
+
+
+def spawn_traders(store, count, body_x, body_y, body_r, sim_time, rng):
+    """
+    Spawns count traders, each orbiting a random body with its own dwell timer.
+    """
+    n = len(body_x)
+    if not n:
+        return
+    for _ in range(count):
+        body = int(rng.integers(n))
+        i = store.spawn(body_x[body], body_y[body], sprite=SPRITE_TRADER, faction=FACTION_TRADER)
+        if i == NONE:
+            return
+        speed = float(rng.uniform(0.3, 0.9)) * (1 if rng.random() < 0.5 else -1)
+        store.anchor_to(i, body, body_r[body] + float(rng.uniform(*TRADER_ORBIT)),
+                        float(rng.uniform(0, 2 * math.pi)), speed, sim_time)
+        store.timer[i] = rng.uniform(*TRADER_DWELL)
+    follow_orbits(store, body_x, body_y, sim_time)
+    np.copyto(store.prev_x[:store.used], store.x[:store.used])
+    np.copyto(store.prev_y[:store.used], store.y[:store.used])
+
+
+def fire(store, x, y, angle, faction=FACTION_PLAYER):
+    # One shot along a ship heading (degrees, pygame convention)
+    rad = math.radians(angle)
+    return store.spawn(x, y, -SHOT_SPEED * math.sin(rad), -SHOT_SPEED * math.cos(rad), angle,
+                       SPRITE_SHOT, faction, SHOT_LIFE)
+
+
+def draw(store, screen, sprites, cam_x, cam_y, width, height, alpha=1.0, rects=None):
+    """
+    Draws every alive entity with a sprite, interpolated between the last two steps by alpha.
+    store may also be an EntityFrame.
+    sprites[id] is a RotationCache for rotating sprites or a plain Surface. Screen culling and
+    interpolation are vectorized; the blits go out in one Surface.blits batch. Appends changed
+    screen rects to rects when given (the whole screen beyond DIRTY_LIMIT). Returns the number drawn.
+    """
+    n = store.used
+    prev_x, prev_y = store.prev_x[:n], store.prev_y[:n]
+    x = prev_x + (store.x[:n] - prev_x) * alpha - cam_x
+    y = prev_y + (store.y[:n] - prev_y) * alpha - cam_y
+    margin = 32
+    visible = np.flatnonzero((store.sprite[:n] >= 0) & (x > -margin) & (x < width + margin)
+                             & (y > -margin) & (y < height + margin))
+    if not len(visible):
+        return 0
+    batch = []
+    append = batch.append
+    for sprite_id in np.unique(store.sprite[visible]).tolist():
+        members = visible[store.sprite[visible] == sprite_id]
+        sprite = sprites[sprite_id]
+        xs, ys = x[members].tolist(), y[members].tolist()
+        if isinstance(sprite, pygame.Surface):
+            w, h = sprite.get_size()
+            for px, py in zip(xs, ys):
+                append((sprite, (px - w // 2, py - h // 2)))
+        else:
+            for px, py, angle in zip(xs, ys, store.angle[members].tolist()):
+                image = sprite.get(angle)[0]
+                w, h = image.get_size()
+                append((image, (px - w // 2, py - h // 2)))
+    if rects is not None and len(batch) <= DIRTY_LIMIT:
+        rects.extend(screen.blits(batch))
+    else:
+        screen.blits(batch, doreturn=False)
+        if rects is not None:
+            rects.append(screen.get_rect())
+    return len(batch)
@@ -4,6 +4,10 @@ Handles game state, player logic, quest system, base management, and world state
 
 import pygame
 from assets import PLAYER_SIZE, PLAYER_SPEED, WORLD_WIDTH, WORLD_HEIGHT
+import gamelog
+from records import Record
+
+quest_log = gamelog.get_logger("quest")
 
 class Player:
     def __init__(self, x, y):
@@ -47,16 +51,55 @@ QUESTS = [
     {"desc": "Mine 2 Rare Metals from Trappist-1h for advanced electronics.", "planet": "Trappist-1h", "material": "Rare Metals", "amount": 2, "collected": 0, "completed": False, "reward": {"size": 10}},
 ]
 
+# Quest progression is grouped by system; each range is (start, end) into QUESTS
+SYSTEM_NAMES = [
+    "Inner Worlds",      # Mercury to Mars
+    "Outer Worlds",      # Jupiter to Pluto
+    "Alpha Centauri",   # Centauri Prime to Centauri Tertius
+    "Trappist-1"        # Trappist-1e to Trappist-1h
+]
+SYSTEM_QUEST_RANGES = [
+    (0, 4),    # Mercury to Mars (0-3)
+    (4, 9),    # Jupiter to Pluto (4-8)
+    (9, 12),   # Centauri Prime to Centauri Tertius (9-11)
+    (12, 15)   # Trappist-1e to Trappist-1h (12-14)
+]
+
+# Quest events, queued on GameState.events when quest state changes
+QUEST_PROGRESS = "progress"
+QUEST_COMPLETED = "completed"
+SYSTEM_ADVANCED = "system_advanced"
+GAME_COMPLETED = "game_completed"
+
+class Quest(Record):
+    """
+    One quest; fields are the keys of the QUESTS dicts.
+    """
+    __slots__ = ("desc", "planet", "material", "amount", "collected", "completed", "reward")
+
+class Base(Record):
+    """
+    A base built on a planet.
+    """
+    __slots__ = ("level", "revenue", "last_collected")
+
 class GameState:
-    def __init__(self):
+    def __init__(self, quests=None, system_ranges=None):
         self.player = Player(WORLD_WIDTH//2, WORLD_HEIGHT//2 + 300)
-        self.quests = [q.copy() for q in QUESTS]
+        self.quests = [Quest.from_dict(q) for q in (QUESTS if quests is None else quests)]
         # Ensure all quests start as incomplete
         for q in self.quests:
-            q['completed'] = False
-            q['collected'] = 0
+            q.completed = False
+            q.collected = 0
         self.current_quest = 0
-        self.bases = {}  # planet_name: {level, revenue, last_collected}
+        # Quest engine: per-system active quest pointers, updated incrementally. Only the active
+        # quest can take progress, so the pointer is the whole lookup; no per-planet index is kept
+        self.system_ranges = list(SYSTEM_QUEST_RANGES if system_ranges is None else system_ranges)
+        self.current_system = 0
+        self._active = [start for start, _ in self.system_ranges]
+        self.events = []
+        self.game_completed = False
+        self.bases = {}  # planet_name: Base
         self.revenue = 0
         self.menu_open = False
         self.tech_tree_open = False
@@ -86,9 +129,78 @@ class GameState:
         self.landed_message_timer = 0
         self.show_map = False
 
+    def active_quest(self, system=None):
+        """
+        Index of the first incomplete quest in the system (default: current system), or None.
+        """
+        system = self.current_system if system is None else system
+        idx = self._active[system]
+        return idx if idx < self.system_ranges[system][1] else None
+
+    def collect(self, planet, material, amount=1):
+        """
+        Adds progress to the active quest if it targets this planet and material.
+        Returns True if progress was made; state changes are queued on self.events.
+        """
+        idx = self.active_quest()
+        if idx is None:
+            return False
+        quest = self.quests[idx]
+        if quest.planet != planet or quest.material != material:
+            return False
+        quest.collected = min(quest.amount, quest.collected + amount)
+        self.events.append((QUEST_PROGRESS, idx))
+        if quest.collected >= quest.amount:
+            self.complete_quest(idx)
+        return True
+
     def complete_quest(self, quest_idx):
-        if 0 <= quest_idx < len(self.quests):
-            self.quests[quest_idx]['completed'] = True
+        if not (0 <= quest_idx < len(self.quests)) or self.quests[quest_idx].completed:
+            return
+        self.quests[quest_idx].completed = True
+        self.events.append((QUEST_COMPLETED, quest_idx))
+        for system, (start, end) in enumerate(self.system_ranges):
+            if start <= quest_idx < end:
+                self._advance(system)
+                break
+
+    def _advance(self, system):
+        # Move the system's pointer past completed quests; amortized O(1) per quest
+        start, end = self.system_ranges[system]
+        idx = self._active[system]
+        while idx < end and self.quests[idx].completed:
+            idx += 1
+        self._active[system] = idx
+        if system != self.current_system:
+            return
+        if idx < end:
+            self.current_quest = idx
+            quest_log.info("Next quest set to %s (%s)", self.quests[idx].planet, self.quests[idx].material)
+        elif self.current_system + 1 < len(self.system_ranges):
+            self.current_system += 1
+            self.events.append((SYSTEM_ADVANCED, self.current_system))
+            self._advance(self.current_system)
+        else:
+            # End of game, keep last quest
+            self.current_quest = len(self.quests) - 1
+            self.game_completed = True
+            self.events.append((GAME_COMPLETED, self.current_quest))
+            quest_log.info("All systems complete. Game end.")
+
+    def poll_events(self):
+        events = self.events
+        self.events = []
+        return events
+
+    def validate_quests(self, planet_data):
+        # Content check, run once: every quest must point at an existing planet and material
+        planets = {p["name"] for p in planet_data}
+        materials = {p["material"] for p in planet_data}
+        for q in self.quests:
+            if q.planet not in planets:
+                quest_log.warning("Quest planet '%s' not found in planet data!", q.planet)
+            if q.material not in materials:
+                quest_log.warning("Quest material '%s' not found in planet data!", q.material)
 
     def can_collect_resource(self, planet, material):
         """
@@ -96,17 +208,17 @@ class GameState:
         Debugs mismatches if collection fails.
         """
         if not (0 <= self.current_quest < len(self.quests)):
-            print(f"[DEBUG] Invalid current_quest index: {self.current_quest}")
+            quest_log.debug("Invalid current_quest index: %s", self.current_quest)
             return False
         quest = self.quests[self.current_quest]
-        if quest['completed']:
-            print(f"[DEBUG] Quest already completed: {quest}")
+        if quest.completed:
+            quest_log.debug("Quest already completed: %s", quest)
             return False
-        if quest['planet'] != planet:
-            print(f"[DEBUG] Planet mismatch: quest expects '{quest['planet']}', got '{planet}'")
+        if quest.planet != planet:
+            quest_log.debug("Planet mismatch: quest expects '%s', got '%s'", quest.planet, planet)
             return False
-        if quest['material'] != material:
-            print(f"[DEBUG] Material mismatch: quest expects '{quest['material']}', got '{material}'")
+        if quest.material != material:
+            quest_log.debug("Material mismatch: quest expects '%s', got '%s'", quest.material, material)
             return False
         return True
 
@@ -0,0 +1,132 @@
+"""
+Level-gated, per-category logging with an in-memory ring buffer.
+
+Categories are child loggers of "spacegame" (quest, physics, render, save). A disabled level costs
+one isEnabledFor check; guard anything expensive to build behind enabled(). Records that pass
+the category level go to the ring buffer, and WARNING and above are also printed.
+
+Levels can be set at launch with SPACEGAME_LOG, e.g. SPACEGAME_LOG="quest=DEBUG,console=DEBUG";
+"console" sets the level printed to stdout.
+"""
+
+import logging
+import os
+import sys
+import threading
+from collections import deque
+
+CATEGORIES = ("quest", "physics", "render", "save")
+RING_SIZE = 2000
+FORMAT = "%(relativeCreated)10.1f %(levelname)-7s [%(category)s] %(message)s"
+
+
+class RingBufferHandler(logging.Handler):
+    """
+    Keeps the last `capacity` records unformatted; formatting only happens on dump().
+    """
+    def __init__(self, capacity=RING_SIZE):
+        super().__init__()
+        self.records = deque(maxlen=capacity)
+
+    def emit(self, record):
+        self.records.append(record)
+
+    def dump(self, stream=None):
+        stream = stream or sys.stderr
+        for record in list(self.records):
+            stream.write(self.format(record) + "\n")
+        stream.flush()
+
+
+class _CategoryFilter(logging.Filter):
+    def filter(self, record):
+        record.category = record.name.rsplit(".", 1)[-1]
+        return True
+
+
+_root = logging.getLogger("spacegame")
+_root.setLevel(logging.DEBUG)
+_root.propagate = False
+
+ring = RingBufferHandler()
+ring.setFormatter(logging.Formatter(FORMAT))
+ring.addFilter(_CategoryFilter())
+_root.addHandler(ring)
+
+_console = logging.StreamHandler(sys.stdout)
+_console.setLevel(logging.WARNING)
+_console.setFormatter(logging.Formatter(FORMAT))
+_console.addFilter(_CategoryFilter())
+_root.addHandler(_console)
+
+for _category in CATEGORIES:
+    _root.getChild(_category).setLevel(logging.WARNING)
+
+
+def get_logger(category):
+    return _root.getChild(category)
+
+
+def _level(level):
+    # Level names are case-insensitive; unknown names raise ValueError
+    if isinstance(level, str):
+        names = logging.getLevelNamesMapping()
+        if level.upper() not in names:
+            raise ValueError(f"Unknown log level {level!r}")
+        level = names[level.upper()]
+    return level
+
+
+def set_level(category, level):
+    get_logger(category).setLevel(_level(level))
+
+
+def set_console_level(level):
+    _console.setLevel(_level(level))
+
+
+def enabled(logger, level=logging.DEBUG):
+    return logger.isEnabledFor(level)
+
+
+def dump(stream=None):
+    ring.dump(stream)
+
+
+def install_crash_dump():
+    """
+    Dumps the ring buffer to stderr before the default handler prints an uncaught exception,
+    on the main thread or any other.
+    """
+    previous = sys.excepthook
+
+    def hook(exc_type, exc, tb):
+        sys.stderr.write("--- last log records ---\n")
+        dump(sys.stderr)
+        previous(exc_type, exc, tb)
+
+    sys.excepthook = hook
+
+    previous_thread_hook = threading.excepthook
+
+    def thread_hook(args):
+        sys.stderr.write("--- last log records ---\n")
+        dump(sys.stderr)
+        previous_thread_hook(args)
+
+    threading.excepthook = thread_hook
+
+
+def configure_from_env(var="SPACEGAME_LOG"):
+    spec = os.environ.get(var, "")
+    for item in spec.split(","):
+        if "=" in item:
+            category, level = (part.strip() for part in item.split("=", 1))
+            # A typo in a debug setting must not stop the game; skip the entry instead
+            try:
+                if category == "console":
+                    set_console_level(level)
+                else:
+                    set_level(category, level)
+            except ValueError as e:
+                print(f"Ignoring {var} entry {item.strip()!r}: {e}", file=sys.stderr)
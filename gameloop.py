@@ -0,0 +1,706 @@
+"""
+The game loop as an importable object: Game.step advances the simulation by one fixed step,
+Game.advance feeds it real frame time through a fixed-timestep accumulator, and Game.render
+draws the state interpolated between the last two steps to any surface. Nothing here opens a
+window, so the simulation can run headless (see headless.py).
+"""
+
+import math
+import time
+import random
+import logging
+import numpy as np
+import pygame
+from assets import WIDTH, HEIGHT, WHITE, SUN_COLOR, SUN_POS, SUN_RADIUS, PLAYER_SIZE, PLAYER_SPEED, WORLD_WIDTH, WORLD_HEIGHT, load_spaceship_image, get_rotation_cache, render_text
+from planets import PLANETS, PlanetTable, TICK_RATE
+from game import GameState, SYSTEM_NAMES, QUEST_COMPLETED, SYSTEM_ADVANCED, GAME_COMPLETED
+from starfield import StarField
+from spatial import SpatialGrid
+from systemmap import SystemMap
+from universe import Universe
+from profiler import Profiler
+from records import Record
+import entities
+import particles
+import ui
+import gamelog
+
+quest_log = gamelog.get_logger("quest")
+
+INTERACT_RANGE = 30  # Distance from a planet's surface for E interaction
+COLLECT_RANGE = 30   # Distance from a planet's surface for quest auto-collection
+HYPERJUMP_DURATION = 120  # frames (2 seconds at 60fps)
+COLLECT_RATE = 60    # Units auto-collected per second in range (one per frame at 60 FPS)
+SIM_RATE = 60        # Fixed simulation steps per second, independent of the render rate
+MAX_STEPS_PER_FRAME = 8  # Beyond this a slow frame drops simulated time instead of spiralling
+MAP_PAN_SPEED = 6    # Map pixels per step while a pan key is held
+TRADER_COUNT = 120   # NPC traders flying between the home planets
+FIRE_INTERVAL = 0.1  # Seconds between shots while fire is held
+EXHAUST_RATE = 900   # Particles per second while thrusting (half that in reverse)
+SPARK_RATE = 400     # Particles per second while auto-collecting
+STREAK_RATE = 3000   # Particles per second during a hyperjump
+
+
+class Inputs:
+    """
+    Player input for one step. Held controls are booleans; the rest are presses for this step only.
+    aim_angle is the ship heading in degrees (pygame rotation convention), or None to keep the current one.
+    """
+    def __init__(self, forward=False, reverse=False, take_off=False, aim_angle=None,
+                 toggle_map=False, toggle_inventory=False, escape=False, interact=False, scroll=0,
+                 zoom=0, map_pan=(0, 0), map_focus=None, fire=False):
+        self.forward = forward
+        self.reverse = reverse
+        self.take_off = take_off
+        self.aim_angle = aim_angle
+        self.toggle_map = toggle_map
+        self.toggle_inventory = toggle_inventory
+        self.escape = escape
+        self.interact = interact
+        self.scroll = scroll
+        self.zoom = zoom            # Map zoom steps, positive zooms out
+        self.map_pan = map_pan      # Held map pan direction (-1/0/1, -1/0/1)
+        self.map_focus = map_focus  # System index to frame on the map, -1 for the whole map
+        self.fire = fire            # Held
+
+    def held(self):
+        """
+        Copy with only the held controls, for extra simulation steps within one frame.
+        """
+        return Inputs(forward=self.forward, reverse=self.reverse, take_off=self.take_off, aim_angle=self.aim_angle,
+                      map_pan=self.map_pan, fire=self.fire)
+
+    def merge(self, newer):
+        """
+        Combines this frame's input with a newer one: held controls from the newer, presses from both.
+        """
+        merged = newer.held()
+        merged.toggle_map = self.toggle_map != newer.toggle_map
+        merged.toggle_inventory = self.toggle_inventory != newer.toggle_inventory
+        merged.escape = self.escape or newer.escape
+        merged.interact = self.interact or newer.interact
+        merged.scroll = self.scroll + newer.scroll
+        merged.zoom = self.zoom + newer.zoom
+        merged.map_focus = newer.map_focus if newer.map_focus is not None else self.map_focus
+        return merged
+
+    @classmethod
+    def from_pygame(cls, events, keys, mouse_pos, width=WIDTH, height=HEIGHT, mouse_buttons=(False, False, False)):
+        inputs = cls(forward=bool(keys[pygame.K_w]), reverse=bool(keys[pygame.K_s]), take_off=bool(keys[pygame.K_SPACE]),
+                     fire=bool(keys[pygame.K_f] or mouse_buttons[0]))
+        # Steer towards the mouse, relative to the screen center
+        dx = mouse_pos[0] - width // 2
+        dy = mouse_pos[1] - height // 2
+        inputs.aim_angle = math.degrees(math.atan2(-dx, -dy))
+        inputs.map_pan = (int(keys[pygame.K_RIGHT]) - int(keys[pygame.K_LEFT]), int(keys[pygame.K_DOWN]) - int(keys[pygame.K_UP]))
+        for event in events:
+            if event.type == pygame.KEYDOWN:
+                if event.key == pygame.K_ESCAPE:
+                    inputs.escape = True
+                if event.key == pygame.K_m:
+                    inputs.toggle_map = not inputs.toggle_map
+                if event.key == pygame.K_i:
+                    inputs.toggle_inventory = not inputs.toggle_inventory
+                if event.key == pygame.K_e:
+                    inputs.interact = True
+                if event.key == pygame.K_DOWN:
+                    inputs.scroll += 1
+                if event.key == pygame.K_UP:
+                    inputs.scroll -= 1
+                if event.key == pygame.K_MINUS:
+                    inputs.zoom += 1
+                if event.key in (pygame.K_EQUALS, pygame.K_PLUS):
+                    inputs.zoom -= 1
+                if pygame.K_0 <= event.key <= pygame.K_9:
+                    inputs.map_focus = event.key - pygame.K_1 if event.key != pygame.K_0 else -1
+            if event.type == pygame.MOUSEBUTTONDOWN:
+                if event.button == 5:  # Mouse wheel down
+                    inputs.scroll += 1
+                    inputs.zoom += 1
+                if event.button == 4:  # Mouse wheel up
+                    inputs.scroll -= 1
+                    inputs.zoom -= 1
+        return inputs
+
+
+class Snapshot(Record):
+    """
+    Everything render() reads from the simulation, copied at the end of a step. Buffers come
+    from Game.new_snapshot() with their columns preallocated and are refilled in place by
+    Game.snapshot(), so one thread can draw a snapshot while another fills the next.
+    """
+    __slots__ = ("time", "alpha", "sim_time", "prev_time", "player", "prev_player", "landed", "collecting",
+                 "hyperjump", "local_systems", "quest", "marker", "compass", "map", "map_x", "map_y",
+                 "show_inventory", "inventory", "inventory_scroll", "entities", "particles", "menu_open")
+
+
+class Game:
+    def __init__(self, seed=None, ship_img=None, sim_rate=SIM_RATE, profiler=None, universe=True, traders=TRADER_COUNT):
+        # Timing scopes around each stage; a disabled Profiler costs next to nothing
+        self.profiler = profiler if profiler is not None else Profiler()
+        self.state = GameState()
+        self.state.validate_quests(PLANETS)
+        # Star field covering the whole world, generated per chunk as the camera moves
+        self.starfield = StarField(seed=random.randrange(1 << 30) if seed is None else seed)
+        # Generated systems beyond the home system (same seed), streamed in around the player.
+        # Without a universe the world is the classic bounded home system.
+        self.universe = Universe(seed=self.starfield.seed) if universe else None
+        self.local_systems = []  # Generated systems close enough to simulate
+        self.local_quest = None  # (system, quest index) while inside a system with open quests
+        self._body_system = {}   # id(body dict) -> generated system owning it
+        # Orbits are evaluated in bulk on the array-backed planet table
+        self.planet_table = PlanetTable(PLANETS)
+        self.sim_time = 0.0  # Seconds of simulated time; planet positions are a function of it
+        self.ticks = 0
+        # Fixed timestep: frames add real time to the accumulator, which is drained in sim_rate steps
+        self.sim_rate = sim_rate
+        self.accumulator = 0.0
+        self.alpha = 1.0  # Render blend between the previous (0) and current (1) sim state
+        self.planets = self.planet_table.view(SUN_POS)
+        # Broad-phase index over the current planet positions, rebuilt when orbits move
+        self.proximity = SpatialGrid(cell_size=1024)
+        self.proximity.rebuild(self.planets)
+        # Map view state lives here so zoom and pan survive closing the map
+        systems = [(name, [q.planet for q in self.state.quests[start:end]])
+                   for name, (start, end) in zip(SYSTEM_NAMES, self.state.system_ranges)]
+        self.system_map = SystemMap(PLANETS, size=(350, 350), systems=systems)
+        # Planets quests may collect from
+        self.allowed_planets = set(p["name"] for p in PLANETS)
+
+        # Player world position (centered on Earth at start)
+        self.player_x, self.player_y = SUN_POS[0], SUN_POS[1] + 1800
+        self.player_angle = 0
+        self.player_speed = PLAYER_SPEED
+        self.player_size = PLAYER_SIZE
+        self.landed_planet = None
+        self.landed_angle = None  # Angle at which the ship landed
+        # Previous sim state, for render interpolation
+        self.prev_time = self.sim_time
+        self.prev_x, self.prev_y = self.player_x, self.player_y
+        self.prev_angle = self.player_angle
+
+        self.show_map = False
+        self.show_inventory = False  # Track if inventory modal is open
+        self.inventory_scroll = 0    # Track scroll offset for inventory
+        self.marker_planet = None    # Compass/marker target, always the current quest planet
+        self.collecting = None       # Material being auto-collected this step, for the prompt
+        self._collect_progress = 0.0 # Fractional units collected so far
+        self.in_hyperjump = False
+        self.hyperjump_timer = 0
+        self.end_game = False  # Track if the game has ended
+
+        # NPC traders and projectiles live in array columns, see entities.py
+        self.entities = entities.EntityStore()
+        self.traders = traders
+        self._fire_cooldown = 0.0
+        self.reset_entities()
+        # Exhaust, collection sparks and hyperjump streaks; purely visual and never saved
+        self.particles = particles.ParticlePool(seed=self.starfield.seed)
+        self._collect_planet = None
+
+        # Render-only resources are created on first render so headless runs never need them
+        self.ship_img = ship_img
+        self._ship_load_failed = False
+        self.planet_sprites = None
+        self.ship_rotations = None
+        self.entity_sprites = None
+        self._sprite_source = None  # ship_img the ship and trader sprites were built from
+        self._own_snapshot = None   # Buffer for render() calls without a snapshot
+        # Map drawing keeps its own SystemMap (layer caches), following system_map's view state
+        self._render_map = SystemMap(PLANETS, size=self.system_map.size, systems=systems)
+        self.hud = None
+        # Dirty-rect presentation state, see _dirty_rects
+        self._full_redraw = True
+        self._last_cam = None
+        self._prev_dirty = []
+        # Separate table for interpolated render positions, so rendering never moves the sim's planets
+        self._render_table = PlanetTable(PLANETS)
+
+    # --- SIMULATION ---
+    def step(self, inputs, dt):
+        """
+        Advances the game by exactly one simulation step of dt seconds.
+        """
+        self._apply_inputs(inputs)
+        self._simulate(inputs, dt)
+        self.alpha = 1.0
+
+    def advance(self, inputs, frame_dt):
+        """
+        Advances by frame_dt seconds of real time in fixed 1/sim_rate steps, carrying the
+        remainder to the next frame. Presses apply once per frame even if no step runs.
+        """
+        self._apply_inputs(inputs)
+        step_dt = 1 / self.sim_rate
+        self.accumulator += frame_dt
+        steps = 0
+        while self.accumulator >= step_dt:
+            if steps == MAX_STEPS_PER_FRAME:
+                self.accumulator = 0.0
+                break
+            self._simulate(inputs.held(), step_dt)
+            self.accumulator -= step_dt
+            steps += 1
+        self.alpha = self.accumulator / step_dt
+        return steps
+
+    def _simulate(self, inputs, dt):
+        state = self.state
+        self.ticks += 1
+        self.prev_time = self.sim_time
+        self.prev_x, self.prev_y = self.player_x, self.player_y
+        self.prev_angle = self.player_angle
+        prof = self.profiler
+        # Update planet orbits
+        with prof.section("orbits"):
+            self.sim_time += dt
+            self.planet_table.set_time(self.sim_time)
+            self.planets = self.planet_table.view(SUN_POS)
+            if self.universe is not None:
+                self._stream_systems()
+            self.proximity.rebuild(self.planets)
+        with prof.section("entities"):
+            self._update_entities(dt)
+        # Always update marker to current quest planet
+        self._update_marker()
+        # The inventory modal pauses the ship and quests
+        if self.show_inventory or state.menu_open:
+            return
+        with prof.section("movement"):
+            self._move(inputs, dt)
+            self._fire(inputs, dt)
+        with prof.section("quests"):
+            self._update_quests(dt)
+            self._update_hyperjump(dt)
+        with prof.section("effects"):
+            self._emit_particles(inputs, dt)
+
+    def _apply_inputs(self, inputs):
+        state = self.state
+        if inputs.escape:
+            if self.show_inventory:
+                self.show_inventory = False
+            else:
+                state.menu_open = True
+        if inputs.toggle_map:
+            self.show_map = not self.show_map
+        if inputs.toggle_inventory:
+            self.show_inventory = not self.show_inventory
+        if self.show_inventory:
+            self.inventory_scroll += inputs.scroll
+        elif self.show_map:
+            # Map: wheel or -/+ zooms, held arrows pan, 1-4 frame a system, 0 shows all
+            system_map = self.system_map
+            if inputs.map_focus is not None:
+                system_map.focus(inputs.map_focus if inputs.map_focus >= 0 else None)
+            system_map.zoom_by(inputs.zoom)
+            system_map.pan(inputs.map_pan[0] * MAP_PAN_SPEED, inputs.map_pan[1] * MAP_PAN_SPEED)
+        if inputs.interact and not self.show_inventory and not self.show_map and not state.menu_open:
+            # Interact/Collect: Only if near quest planet
+            for planet in self.proximity.bodies_within(self.player_x, self.player_y, INTERACT_RANGE):
+                # Interact logic placeholder (can be expanded)
+                pass
+        # Clamp scroll
+        max_scroll = max(0, len(state.player.inventory) - 6)
+        self.inventory_scroll = max(0, min(self.inventory_scroll, max_scroll))
+
+    def _stream_systems(self):
+        # Generated bodies join the planet list only while their system is near the player
+        systems = self.universe.active(self.player_x, self.player_y)
+        self.local_systems = systems
+        if not systems:
+            if self._body_system:
+                self._body_system = {}
+            return
+        planets = list(self.planets)
+        body_system = {}
+        for system in systems:
+            system.table.set_time(self.sim_time)
+            bodies = system.table.view(system.star_pos)
+            planets.extend(bodies)
+            for body in bodies:
+                body_system[id(body)] = system
+        self.planets = planets
+        self._body_system = body_system
+
+    def reset_entities(self):
+        """
+        Despawns every entity and spawns the traders around the home planets at the current sim time.
+        """
+        store = self.entities
+        store.clear()
+        self._rng = np.random.default_rng(self.starfield.seed)
+        xs, ys = self.planet_table.positions(SUN_POS)
+        entities.spawn_traders(store, self.traders, xs, ys, self.planet_table.size, self.sim_time, self._rng)
+
+    def _update_entities(self, dt):
+        # Systems over the entity columns; traders follow the home planets' orbits
+        store = self.entities
+        xs, ys = self.planet_table.positions(SUN_POS)
+        entities.expire(store, dt)
+        entities.steer_traders(store, xs, ys, self.planet_table.size, self.sim_time, dt, self._rng)
+        entities.move(store, dt)
+        entities.follow_orbits(store, xs, ys, self.sim_time)
+
+    def _fire(self, inputs, dt):
+        self._fire_cooldown = max(0.0, self._fire_cooldown - dt)
+        if inputs.fire and self.landed_planet is None and self._fire_cooldown == 0.0:
+            entities.fire(self.entities, self.player_x, self.player_y, self.player_angle)
+            self._fire_cooldown = FIRE_INTERVAL
+
+    def _emit_particles(self, inputs, dt):
+        # Particles move with the simulation, so they freeze with it under the inventory and menu
+        if dt <= 0:
+            return  # No motion to derive the ship's velocity from
+        pool = self.particles
+        pool.update(dt)
+        x, y = self.player_x, self.player_y
+        vx, vy = (x - self.prev_x) / dt, (y - self.prev_y) / dt
+        rad = math.radians(self.player_angle)
+        fx, fy = -math.sin(rad), -math.cos(rad)  # Ship heading as a unit vector
+        back = math.atan2(-fy, -fx)
+        if self.landed_planet is None:
+            nose = self.player_size * 0.4
+            if inputs.forward:
+                pool.emit(EXHAUST_RATE * dt, x - fx * nose, y - fy * nose, back, 0.5, 240, 0.5,
+                          particles.EXHAUST, vx, vy, 3)
+            if inputs.reverse:
+                pool.emit(EXHAUST_RATE * dt / 2, x + fx * nose, y + fy * nose, back + math.pi, 0.5, 160, 0.35,
+                          particles.EXHAUST, vx, vy, 3)
+        planet = self._collect_planet
+        if planet is not None:
+            px, py = planet.pos
+            dx, dy = x - px, y - py
+            pool.emit(SPARK_RATE * dt, px, py, math.atan2(dy, dx), 0.6, math.hypot(dx, dy) / 0.6, 0.6,
+                      particles.SPARK, jitter=planet.radius * 0.4)
+        if self.in_hyperjump:
+            pool.emit(STREAK_RATE * dt, x + fx * 400, y + fy * 400, back, 0.05, 1600, 0.5,
+                      particles.STREAK, jitter=500)
+
+    def _update_hyperjump(self, dt):
+        if self.in_hyperjump:
+            self.hyperjump_timer += dt * TICK_RATE
+            if self.hyperjump_timer >= HYPERJUMP_DURATION:
+                self.in_hyperjump = False
+
+    def _update_marker(self):
+        state = self.state
+        # Inside a generated system with open quests, those take over the marker
+        self.local_quest = None
+        for system in self.local_systems:
+            idx = system.active_quest()
+            if idx is not None:
+                self.local_quest = (system, idx)
+                bodies = system.table.view(system.star_pos)
+                self.marker_planet = bodies[system.table.index[system.quests[idx].planet]]
+                return
+        # Set marker_planet to the planet for the current quest
+        if 0 <= state.current_quest < len(state.quests):
+            quest = state.quests[state.current_quest]
+            i = self.planet_table.index.get(quest.planet)
+            if i is not None:
+                self.marker_planet = self.planets[i]
+                return
+        self.marker_planet = None
+
+    def _move(self, inputs, dt):
+        # --- PLAYER MOVEMENT & LANDING (ship sticks to planet) ---
+        move_x, move_y = 0, 0
+        frames = dt * TICK_RATE  # Speeds are tuned per 60 FPS frame
+        if inputs.aim_angle is not None:
+            self.player_angle = inputs.aim_angle
+        if self.landed_planet is None:
+            # Acceleration (W for forward, S for reverse)
+            rad = math.radians(self.player_angle)
+            if inputs.forward:
+                move_x += -self.player_speed * math.sin(rad) * frames
+                move_y += -self.player_speed * math.cos(rad) * frames
+            if inputs.reverse:
+                move_x -= -self.player_speed * math.sin(rad) * 0.5 * frames
+                move_y -= -self.player_speed * math.cos(rad) * 0.5 * frames
+        elif self.landed_angle is not None:
+            # While landed, stick to the planet edge at the angle where the ship landed
+            px, py = self.landed_planet.pos
+            pr = self.landed_planet.radius
+            self.player_x = px + (pr + self.player_size // 2) * math.cos(self.landed_angle)
+            self.player_y = py + (pr + self.player_size // 2) * math.sin(self.landed_angle)
+
+        # Planet collision/landing
+        next_x, next_y = self.player_x + move_x, self.player_y + move_y
+        touching = self.proximity.bodies_within(next_x, next_y, self.player_size // 2)
+        if touching:
+            planet = touching[0]
+            px, py = planet.pos
+            if self.landed_planet is None:
+                # Just landed: record the angle
+                self.landed_angle = math.atan2(next_y - py, next_x - px)
+            self.landed_planet = planet
+        else:
+            self.player_x, self.player_y = next_x, next_y
+            self.landed_planet = None
+            self.landed_angle = None
+        if inputs.take_off and self.landed_planet is not None:
+            self.landed_planet = None  # Take off
+            self.landed_angle = None
+
+    def _update_quests(self, dt):
+        # --- QUEST LOGIC: Progress by system, hyperspeed to next when all done ---
+        # The quest engine tracks the active quest; only nearby planets are checked
+        state = self.state
+        self.collecting = None
+        self._collect_planet = None
+        active_quest_idx = state.active_quest()
+        if quest_log.isEnabledFor(logging.DEBUG):
+            start_idx, end_idx = state.system_ranges[state.current_system]
+            quest_log.debug("--- QUEST LOGIC FRAME --- current_system: %s", state.current_system)
+            for idx in range(start_idx, end_idx):
+                q = state.quests[idx]
+                quest_log.debug("    [%d] %s (%s): collected=%s, amount=%s, completed=%s", idx, q.planet, q.material, q.collected, q.amount, q.completed)
+            quest_log.debug("active_quest_idx: %s, current_quest: %s", active_quest_idx, state.current_quest)
+        if active_quest_idx is not None or self.local_systems:
+            for planet in self.proximity.bodies_within(self.player_x, self.player_y, COLLECT_RANGE):
+                owner = self._body_system.get(id(planet))
+                if owner is None and planet.name not in self.allowed_planets:
+                    quest_log.debug("Skipping planet %s (not in allowed_planets)", planet.name)
+                    continue
+                mat = planet.material
+                # Auto-collect at COLLECT_RATE: progress only counts whole units
+                self._collect_progress += COLLECT_RATE * dt
+                units = int(self._collect_progress)
+                self._collect_progress -= units
+                if owner is not None:
+                    if units and not self.universe.collect(owner, planet.name, mat, units):
+                        quest_log.debug("Collection did not progress: %s (%s) is not %s's active quest", planet.name, mat, owner.name)
+                elif units and not state.collect(planet.name, mat, units):
+                    quest_log.debug("Collection did not progress: %s (%s) is not the active quest", planet.name, mat)
+                self.collecting = mat
+                self._collect_planet = planet
+                break
+        if self.collecting is None:
+            self._collect_progress = 0.0
+        for event, idx in state.poll_events():
+            if event == QUEST_COMPLETED:
+                quest_log.info("Quest completed for %s (%s)!", state.quests[idx].planet, state.quests[idx].material)
+            elif event == SYSTEM_ADVANCED:
+                # All quests in the previous system complete, trigger hyperspeed
+                self.in_hyperjump = True
+                self.hyperjump_timer = 0
+            elif event == GAME_COMPLETED:
+                self.end_game = True  # Set end game flag
+
+    def new_snapshot(self):
+        """
+        An empty Snapshot buffer for snapshot(), with its entity, particle and map columns allocated.
+        """
+        return Snapshot(entities=entities.EntityFrame(self.entities.capacity),
+                        particles=particles.ParticlePool(self.particles.capacity),
+                        map_x=np.zeros(len(PLANETS)), map_y=np.zeros(len(PLANETS)), inventory={})
+
+    def snapshot(self, into=None):
+        """
+        Copies the state render() needs into a Snapshot buffer (a new one if into is None) and
+        returns it. Runs on the simulation's thread.
+        """
+        snap = self.new_snapshot() if into is None else into
+        state = self.state
+        marker = compass = None
+        marker_planet = self.marker_planet
+        if marker_planet is not None:
+            dx = marker_planet.pos[0] - self.player_x
+            dy = marker_planet.pos[1] - self.player_y
+            marker = (marker_planet.name, int(math.hypot(dx, dy)))
+            compass = ui.compass_value(marker_planet.name, dx, dy)
+        if self.local_quest is not None:
+            system, idx = self.local_quest
+            snap.quest = ui.quest_bar_value(idx, system.quests)
+        else:
+            snap.quest = ui.quest_bar_value(state.current_quest, state.quests)
+        snap.marker, snap.compass = marker, compass
+        snap.hyperjump = None
+        if self.in_hyperjump:
+            snap.hyperjump = SYSTEM_NAMES[min(state.current_system, len(SYSTEM_NAMES) - 1)]
+        snap.map = None
+        if self.show_map:
+            xs, ys = self.planet_table.positions(SUN_POS)
+            np.copyto(snap.map_x, xs)
+            np.copyto(snap.map_y, ys)
+            view = self.system_map
+            snap.map = (view.zoom, view.center, view.focused, marker[0] if marker else None)
+        snap.show_inventory = self.show_inventory
+        if self.show_inventory:
+            snap.inventory_scroll = self.inventory_scroll
+            inventory = state.player.inventory
+            if snap.inventory != inventory:  # Refilled in place, only when it changed
+                snap.inventory.clear()
+                snap.inventory.update(inventory)
+        snap.time, snap.alpha = time.perf_counter(), self.alpha
+        snap.sim_time, snap.prev_time = self.sim_time, self.prev_time
+        snap.player = (self.player_x, self.player_y, self.player_angle)
+        snap.prev_player = (self.prev_x, self.prev_y, self.prev_angle)
+        snap.landed = self.landed_planet is not None
+        snap.collecting = self.collecting
+        snap.local_systems = tuple(self.local_systems)
+        snap.menu_open = state.menu_open
+        snap.entities.copy_from(self.entities)
+        snap.particles.copy_from(self.particles)
+        return snap
+
+    @staticmethod
+    def interpolated_player(snap, alpha):
+        # Blend between the last two sim states by alpha
+        (x0, y0, angle0), (x1, y1, angle1) = snap.prev_player, snap.player
+        turn = (angle1 - angle0 + 180) % 360 - 180
+        return x0 + (x1 - x0) * alpha, y0 + (y1 - y0) * alpha, angle0 + turn * alpha
+
+    def interpolated_planets(self, snap, alpha):
+        # Orbits are closed-form, so the in-between positions are exact. The render table is
+        # separate from the sim's, which may be stepping on another thread.
+        self._render_table.set_time(snap.prev_time + (snap.sim_time - snap.prev_time) * alpha)
+        return self._render_table.view(SUN_POS)  # Home planets only, without generated bodies
+
+    def interpolated_bodies(self, system, snap, alpha):
+        # Same as interpolated_planets, for a generated system's own render table
+        if system.render_table is None:
+            system.render_table = PlanetTable(system.planets)
+        system.render_table.set_time(snap.prev_time + (snap.sim_time - snap.prev_time) * alpha)
+        return system.render_table.view(system.star_pos)
+
+    def camera(self, player_x=None, player_y=None):
+        # --- CAMERA LOGIC ---
+        if player_x is None:
+            player_x, player_y = self.player_x, self.player_y
+        cam_x = int(player_x + self.player_size // 2 - WIDTH // 2)
+        cam_y = int(player_y + self.player_size // 2 - HEIGHT // 2)
+        if self.universe is None:
+            cam_x = max(0, min(WORLD_WIDTH - WIDTH, cam_x))
+            cam_y = max(0, min(WORLD_HEIGHT - HEIGHT, cam_y))
+        return cam_x, cam_y
+
+    # --- RENDERING ---
+    def _ensure_render_assets(self):
+        if self.ship_img is None and not self._ship_load_failed:
+            # Tried once; without the image traders get outline sprites and the ship is not drawn
+            self.ship_img = load_spaceship_image(self.player_size)
+            self._ship_load_failed = self.ship_img is None
+        if self.entity_sprites is None or self._sprite_source is not self.ship_img:
+            # (Re)built whenever ship_img is set or replaced, e.g. by main.py after loading
+            ship = self._sprite_source = self.ship_img
+            self.ship_rotations = get_rotation_cache("spaceship", ship) if ship is not None else None
+            self.entity_sprites = ui.build_entity_sprites(ship)
+        if self.hud is None:
+            self.hud = {"quest": ui.quest_bar_widget(WIDTH, HEIGHT),
+                        "marker": ui.marker_panel_widget(WIDTH),
+                        "compass": ui.compass_widget(WIDTH)}
+        if self.planet_sprites is None:
+            # Bake planet glow, body and label sprites once
+            self.planet_sprites = ui.build_planet_sprites(PLANETS)
+
+    def render(self, screen, snap=None, alpha=None):
+        """
+        Draws a Snapshot (one of the current state by default), blended by alpha (the
+        snapshot's own by default). Only the snapshot is read, so the simulation may be stepping
+        on another thread meanwhile. Returns the screen rects that changed since the last frame,
+        for display.update.
+        """
+        self._ensure_render_assets()
+        if snap is None:
+            snap = self._own_snapshot = self.snapshot(self._own_snapshot)
+        if alpha is None:
+            alpha = snap.alpha
+        prof = self.profiler
+        player_x, player_y, player_angle = self.interpolated_player(snap, alpha)
+        cam_x, cam_y = self.camera(player_x, player_y)
+        dirty = []  # Screen rects that can change while the camera stands still
+
+        # --- GAME DRAWING ---
+        with prof.section("background"):
+            stars = self.starfield.visible(cam_x, cam_y, WIDTH, HEIGHT)
+            ui.draw_game_background(screen, stars, cam_x, cam_y, WIDTH, HEIGHT, SUN_COLOR, SUN_POS, SUN_RADIUS, WHITE)
+            sun_surf = render_text("Sun", 32, WHITE)
+            screen.blit(sun_surf, (SUN_POS[0] - cam_x - 30, SUN_POS[1] - cam_y - SUN_RADIUS - 30))
+            for system in snap.local_systems:
+                sx, sy = system.star_pos
+                ui.draw_star(screen, system.star_pos, system.star_color, system.star_radius, cam_x, cam_y, WIDTH, HEIGHT)
+                name_surf = render_text(system.name, 32, WHITE)
+                screen.blit(name_surf, (sx - cam_x - name_surf.get_width()//2, sy - cam_y - system.star_radius - 30))
+        with prof.section("planets"):
+            ui.draw_planets(screen, self.interpolated_planets(snap, alpha), self.planet_sprites, cam_x, cam_y, WIDTH, HEIGHT, dirty)
+            for system in snap.local_systems:
+                if system.sprites is None:
+                    system.sprites = ui.build_planet_sprites(system.planets)
+                ui.draw_planets(screen, self.interpolated_bodies(system, snap, alpha), system.sprites, cam_x, cam_y, WIDTH, HEIGHT, dirty)
+        with prof.section("sprites"):  # "entities" is the simulation's section
+            entities.draw(snap.entities, screen, self.entity_sprites, cam_x, cam_y, WIDTH, HEIGHT, alpha, dirty)
+        with prof.section("particles"):
+            snap.particles.draw(screen, cam_x, cam_y, dirty)
+        # Draw spaceship at player position and angle
+        with prof.section("ship"):
+            if self.ship_rotations is not None:
+                # Cached rotation with a subtle ship shadow
+                rotated_img, shadow = self.ship_rotations.get(player_angle)
+                rect = rotated_img.get_rect(center=(int(player_x - cam_x), int(player_y - cam_y)))
+                screen.blit(shadow, rect.topleft)
+                screen.blit(rotated_img, rect.topleft)
+                dirty.append(rect)
+        with prof.section("hud"):
+            # Show landing message if landed
+            if snap.landed:
+                msg = render_text("LANDED! Press SPACE to take off", 40, (255,255,0))
+                dirty.append(screen.blit(msg, (WIDTH//2 - msg.get_width()//2, HEIGHT//2 + 80)))
+            if snap.hyperjump is not None:
+                msg = render_text(f"HYPERSPEED TO {snap.hyperjump.upper()}", 48, (200, 220, 255))
+                dirty.append(screen.blit(msg, (WIDTH//2 - msg.get_width()//2, HEIGHT//2 - 100)))
+            # Show gather prompt (optional, for feedback)
+            if snap.collecting is not None:
+                prompt = render_text(f"Auto-collecting {snap.collecting}...", 36, (255,255,0))
+                dirty.append(screen.blit(prompt, (WIDTH//2 - prompt.get_width()//2, HEIGHT//2 + 120)))
+            # Quest bar (current active quest only), marker panel and compass
+            self._update_hud(screen, dirty, snap)
+
+        # --- MAP VIEW ---
+        if snap.map is not None:
+            with prof.section("map"):
+                self._draw_map(screen, snap)
+        # --- INVENTORY MODAL ---
+        if snap.show_inventory:
+            with prof.section("inventory"):
+                ui.draw_inventory(screen, snap.inventory, WIDTH, HEIGHT, snap.inventory_scroll)
+        return self._dirty_rects(screen, (cam_x, cam_y), dirty, snap)
+
+    def invalidate(self):
+        """
+        Forces the next render to present the whole screen, e.g. after a menu drew over it.
+        """
+        self._full_redraw = True
+
+    def _dirty_rects(self, screen, cam, rects, snap):
+        # With a still camera only moving things change; present them where they were and are now.
+        # A moving camera or an open modal changes everything, and the frame after a modal must
+        # clear it, so both present the whole screen.
+        full = self._full_redraw or cam != self._last_cam
+        self._full_redraw = snap.map is not None or snap.show_inventory
+        self._last_cam = cam
+        prev, self._prev_dirty = self._prev_dirty, rects
+        if full or self._full_redraw:
+            return [screen.get_rect()]
+        return rects + prev
+
+    def _update_hud(self, screen, dirty, snap):
+        # Widgets re-render only when their bound value changes; changed widgets are dirty
+        hud = self.hud
+        for name, value in (("quest", snap.quest),
+                            ("marker", snap.marker), ("compass", snap.compass)):
+            widget = hud[name]
+            if widget.update(value):
+                dirty.append(widget.rect)
+            widget.draw(screen)
+
+    def _draw_map(self, screen, snap):
+        view = self._render_map
+        view.zoom, view.center, view.focused, marker = snap.map
+        map_width, map_height = view.size
+        map_x, map_y = WIDTH//2 - map_width//2, HEIGHT//2 - map_height//2
+        view.draw(screen, (map_x, map_y), snap.map_x, snap.map_y, snap.player[:2], marker)
+        pygame.draw.rect(screen, WHITE, (map_x, map_y, map_width, map_height), 2)
+        exit_surf = render_text("M: close | Wheel/-/+: zoom | Arrows: pan | 1-4, 0: systems", 22, WHITE)
+        screen.blit(exit_surf, (WIDTH//2 - exit_surf.get_width()//2, HEIGHT//2 + map_height//2 + 8))
@@ -0,0 +1,77 @@
+"""
+Headless simulation: runs the game loop without a window (SDL dummy video driver) as fast as
+possible and reports ticks per second. Used for load tests and CI performance tracking.
+
+    python headless.py --ticks 10000
+    python headless.py --ticks 2000 --render   # also render each tick to an offscreen surface
+    python headless.py --traders 1000          # load test with more NPC traders
+"""
+
+import os
+import sys
+import time
+import argparse
+
+
+def scripted_inputs(tick):
+    """
+    Deterministic input: fly forward while slowly turning and firing, so the ship sweeps past planets.
+    """
+    from gameloop import Inputs
+    return Inputs(forward=True, aim_angle=(tick * 0.25) % 360, take_off=tick % 240 == 0, fire=True)
+
+
+def run(ticks=10000, dt=1/60, seed=0, render=False, profile=False, traders=None):
+    os.environ["SDL_VIDEODRIVER"] = "dummy"
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+    import pygame
+    from assets import WIDTH, HEIGHT
+    from gameloop import Game
+    from profiler import Profiler
+
+    pygame.init()
+    surface = None
+    if render:
+        # A dummy display is needed for convert_alpha() in asset loading
+        surface = pygame.display.set_mode((WIDTH, HEIGHT))
+    profiler = Profiler(window=ticks, enabled=profile)
+    game = Game(seed=seed, profiler=profiler) if traders is None else Game(seed=seed, profiler=profiler, traders=traders)
+    start = time.perf_counter()
+    for tick in range(ticks):
+        profiler.begin_frame()
+        game.step(scripted_inputs(tick), dt)
+        if surface is not None:
+            game.render(surface)
+        profiler.end_frame()
+    elapsed = time.perf_counter() - start
+    pygame.quit()
+    return {
+        "ticks": ticks,
+        "seconds": elapsed,
+        "ticks_per_second": ticks / elapsed if elapsed > 0 else float("inf"),
+        "sim_time": game.sim_time,
+        "current_quest": game.state.current_quest,
+        "profile": profiler.stats() if profile else None,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run the simulation headless and report ticks per second.")
+    parser.add_argument("--ticks", type=int, default=10000)
+    parser.add_argument("--dt", type=float, default=1/60, help="seconds per tick")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--render", action="store_true", help="render every tick to an offscreen surface")
+    parser.add_argument("--profile", action="store_true", help="print per-section p50/p95/p99")
+    parser.add_argument("--traders", type=int, default=None, help="number of NPC traders (default: the game's)")
+    args = parser.parse_args(argv)
+    result = run(args.ticks, args.dt, args.seed, args.render, args.profile, args.traders)
+    print(f"{result['ticks']} ticks in {result['seconds']:.3f}s: {result['ticks_per_second']:.0f} ticks/s "
+          f"(sim time {result['sim_time']:.1f}s, quest {result['current_quest']})")
+    if result["profile"]:
+        for name, s in sorted(result["profile"].items(), key=lambda item: -item[1]["p50"]):
+            print(f"  {name:<11} p50 {s['p50']:.3f}  p95 {s['p95']:.3f}  p99 {s['p99']:.3f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -5,7 +5,7 @@ a = Analysis(
     ['main.py'],
     pathex=[],
     binaries=[],
-    datas=[('spaceship.png', '.'), ('assets.py', '.'), ('planets.py', '.'), ('ui.py', '.'), ('game.py', '.')],
+    datas=[('spaceship.png', '.'), ('assets.py', '.'), ('planets.py', '.'), ('ui.py', '.'), ('game.py', '.'), ('starfield.py', '.'), ('spatial.py', '.'), ('gamelog.py', '.'), ('gameloop.py', '.'), ('profiler.py', '.'), ('systemmap.py', '.'), ('savegame.py', '.'), ('universe.py', '.'), ('records.py', '.'), ('entities.py', '.'), ('particles.py', '.'), ('simthread.py', '.'), ('fonts/Lato-Regular.ttf', 'fonts'), ('fonts/OFL.txt', 'fonts')],
     hiddenimports=[],
     hookspath=[],
     hooksconfig={},
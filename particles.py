@@ -0,0 +1,226 @@
+"""
+Pooled particle effects: engine exhaust, collection sparks and hyperjump streaks.
+
+Particles live in fixed-capacity NumPy columns packed at the front, so update() and draw()
+cost is proportional to the particles in use. Dead particles are squeezed out in batches by
+scattering into a second set of columns that is then swapped in, and every temporary is a
+slice of a preallocated scratch buffer: after warmup nothing is allocated per particle or per
+frame.
+"""
+
+import numpy as np
+import pygame
+
+CAPACITY = 32768
+FADE_LEVELS = 8  # Color steps from a particle's start color to its end color
+DRAG = 0.2       # Fraction of velocity kept after one second
+
+# Palettes: (start color, end color)
+EXHAUST, SPARK, STREAK = 0, 1, 2
+PALETTES = [
+    ((255, 230, 150), (140, 40, 20)),   # Engine exhaust
+    ((255, 255, 170), (60, 170, 80)),   # Collection sparks
+    ((230, 245, 255), (50, 90, 220)),   # Hyperjump streaks
+]
+
+_COLUMNS = ("x", "y", "vx", "vy", "life", "inv_life", "palette")
+
+
+class ParticlePool:
+    """
+    Packed particle columns: slots [0, count) are in use, and those with life left are live.
+    Emissions beyond capacity are dropped. Every column has one spare slot at the end, where
+    compaction sends dead particles.
+    """
+    def __init__(self, capacity=CAPACITY, seed=None):
+        self.capacity = capacity
+        self.count = 0
+        self.rng = np.random.default_rng(seed)
+        size = capacity + 1
+        self.x = np.zeros(size)
+        self.y = np.zeros(size)
+        self.vx = np.zeros(size)
+        self.vy = np.zeros(size)
+        self.life = np.zeros(size)      # Seconds left
+        self.inv_life = np.ones(size)   # 1 / lifetime at emission, for fading
+        self.palette = np.zeros(size, dtype=np.intp)
+        # Compaction targets, swapped with the columns above
+        self._spare = {name: np.zeros_like(getattr(self, name)) for name in _COLUMNS}
+        # Scratch buffers, reused by every emit/update/draw
+        self._a = np.zeros(size)
+        self._b = np.zeros(size)
+        self._c = np.zeros(size)
+        self._d = np.zeros(size)
+        self._mask = np.zeros(capacity, dtype=bool)
+        self._mask2 = np.zeros(capacity, dtype=bool)
+        self._dest = np.zeros(capacity, dtype=np.intp)
+        self._px = np.zeros(capacity, dtype=np.intp)
+        self._py = np.zeros(capacity, dtype=np.intp)
+        self._idx = np.zeros(capacity, dtype=np.intp)
+        self._shade = np.zeros(size, dtype=np.intp)
+        self._color = np.zeros(capacity, dtype=np.uint32)
+        self._mapped = None
+        self._mapped_key = None
+
+    def __len__(self):
+        return int(np.count_nonzero(self.life[:self.count] > 0))
+
+    def clear(self):
+        self.count = 0
+
+    def copy_from(self, other):
+        # Replaces this pool's particles with the columns draw() needs from another pool of the
+        # same capacity, e.g. a snapshot buffer drawn on another thread
+        n = self.count = other.count
+        for name in ("x", "y", "life", "inv_life", "palette"):
+            np.copyto(getattr(self, name)[:n], getattr(other, name)[:n])
+
+    def emit(self, count, x, y, angle, spread, speed, life, palette, vx=0.0, vy=0.0, jitter=0.0):
+        """
+        Emits count particles around (x, y) (normally distributed, jitter world units wide), moving
+        at 0.5-1.5x speed in directions angle +- spread/2 (radians, screen convention), plus (vx, vy).
+        Lifetimes are 0.75-1.25x life seconds.
+        """
+        start = self.count
+        end = min(start + int(count), self.capacity)
+        if end <= start:
+            return
+        rng = self.rng
+        direction, scale = self._a[start:end], self._b[start:end]
+        rng.random(out=direction)
+        direction -= 0.5
+        direction *= spread
+        direction += angle
+        rng.random(out=scale)
+        scale += 0.5
+        scale *= speed
+        for pos, vel, trig, base, drift in ((self.x, self.vx, np.cos, x, vx), (self.y, self.vy, np.sin, y, vy)):
+            v = vel[start:end]
+            trig(direction, out=v)
+            v *= scale
+            v += drift
+            p = pos[start:end]
+            rng.standard_normal(out=p)
+            p *= jitter
+            p += base
+        lives = self.life[start:end]
+        rng.random(out=lives)
+        lives *= 0.5
+        lives += 0.75
+        lives *= life
+        np.divide(1.0, lives, out=self.inv_life[start:end])
+        self.palette[start:end] = palette
+        self.count = end
+
+    def update(self, dt):
+        n = self.count
+        if not n:
+            return
+        step = self._a[:n]
+        damp = DRAG ** dt
+        for pos, vel in ((self.x, self.vx), (self.y, self.vy)):
+            v = vel[:n]
+            np.multiply(v, dt, out=step)
+            pos[:n] += step
+            v *= damp
+        life = self.life[:n]
+        life -= dt
+        alive = self._mask[:n]
+        np.greater(life, 0.0, out=alive)
+        kept = int(np.count_nonzero(alive))
+        # Dead particles are left in place (draw skips them) until they are a quarter of the pool
+        if n - kept > n // 4:
+            self._gather(alive)
+            for name in _COLUMNS:
+                column, spare = getattr(self, name), self._spare[name]
+                np.put(spare, self._dest[:n], column[:n], mode="clip")
+                setattr(self, name, spare)
+                self._spare[name] = column
+            self.count = kept
+
+    def _gather(self, keep):
+        # Scatter indices that pack the kept slots to the front; the rest go to the spare slot
+        n = len(keep)
+        dest = self._dest[:n]
+        np.copyto(dest, keep)
+        np.cumsum(dest, out=dest)
+        dest -= 1
+        drop = self._mask2[:n]
+        np.logical_not(keep, out=drop)
+        np.copyto(dest, self.capacity, where=drop)
+        return dest
+
+    def _colors(self, surface):
+        # Palette x fade level, mapped to the surface's pixel format once
+        key = (surface.get_bitsize(), surface.get_masks())
+        if key != self._mapped_key:
+            colors = []
+            for start, end in PALETTES:
+                for level in range(FADE_LEVELS):
+                    t = level / (FADE_LEVELS - 1)  # 0 = about to die, 1 = just emitted
+                    colors.append(surface.map_rgb(tuple(int(e + (s - e) * t) for s, e in zip(start, end))))
+            self._mapped = np.array(colors, dtype=np.uint32)
+            self._mapped_key = key
+        return self._mapped
+
+    def draw(self, surface, cam_x, cam_y, rects=None):
+        """
+        Plots every on-screen particle as a 2x2 pixel block, in one vectorized write on 32-bit
+        surfaces and one fill per particle on other pixel formats. Appends the bounding rect of
+        the drawn particles to rects when given. Returns the count drawn.
+        """
+        n = self.count
+        if not n:
+            return 0
+        w, h = surface.get_size()
+        mask, inside = self._mask[:n], self._mask2[:n]
+        sx, sy = self._a[:n], self._b[:n]
+        np.subtract(self.x[:n], cam_x, out=sx)
+        np.subtract(self.y[:n], cam_y, out=sy)
+        np.greater(self.life[:n], 0.0, out=mask)
+        for coord, limit in ((sx, w - 1), (sy, h - 1)):
+            np.greater_equal(coord, 0.0, out=inside)
+            mask &= inside
+            np.less(coord, limit, out=inside)
+            mask &= inside
+        drawn = int(np.count_nonzero(mask))
+        if not drawn:
+            return 0
+        # Fade level from remaining life, offset into the particle's palette
+        level = self._c[:n]
+        np.multiply(self.life[:n], self.inv_life[:n], out=level)
+        level *= FADE_LEVELS - 1
+        shade, offset = self._idx[:n], self._px[:n]
+        np.copyto(shade, level, casting="unsafe")
+        np.minimum(shade, FADE_LEVELS - 1, out=shade)
+        np.multiply(self.palette[:n], FADE_LEVELS, out=offset)
+        shade += offset
+        # Pack the on-screen particles to the front of the scratch buffers
+        dest = self._gather(mask)
+        np.put(self._c, dest, sx, mode="clip")
+        np.put(self._d, dest, sy, mode="clip")
+        np.put(self._shade, dest, shade, mode="clip")
+        px, py, idx = self._px[:drawn], self._py[:drawn], self._idx[:drawn]
+        np.copyto(px, self._c[:drawn], casting="unsafe")
+        np.copyto(py, self._d[:drawn], casting="unsafe")
+        if rects is not None:
+            left, top = int(px.min()), int(py.min())
+            rects.append(pygame.Rect(left, top, int(px.max()) - left + 2, int(py.max()) - top + 2))
+        color = self._color[:drawn]
+        np.take(self._colors(surface), self._shade[:drawn], out=color, mode="clip")
+        if surface.get_bytesize() != 4:
+            # 8/16/24-bit surfaces: the buffer is not uint32 pixels, so let pygame write each block
+            fill = surface.fill
+            for x, y, c in zip(px.tolist(), py.tolist(), color.tolist()):
+                fill(c, (x, y, 2, 2))
+            return drawn
+        # Flat pixel indices into the locked surface buffer; rows are pitch bytes apart
+        stride = surface.get_pitch() // 4
+        np.multiply(py, stride, out=idx)
+        idx += px
+        pixels = np.frombuffer(surface.get_buffer(), dtype=np.uint32)
+        for step in (0, 1, stride - 1, 1):  # Top-left, top-right, bottom-left, bottom-right
+            idx += step
+            np.put(pixels, idx, color)
+        del pixels
+        return drawn
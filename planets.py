@@ -3,7 +3,9 @@ Contains planet data, orbit logic, and planet-related helpers.
 """
 
 import math
+import numpy as np
 from assets import SUN_POS
+from records import Record
 
 # Each planet has: name, orbit_radius, color, material, size, angle, speed
 PLANETS = [
@@ -28,6 +30,20 @@ PLANETS = [
 ]
 
 
+class Body(Record):
+    """
+    A body's per-frame view: the keys get_planet_positions puts in its dicts, as slots.
+    """
+    __slots__ = ("name", "pos", "color", "material", "radius")
+
+    def __init__(self, name, pos, color, material, radius):
+        self.name = name
+        self.pos = pos
+        self.color = color
+        self.material = material
+        self.radius = radius
+
+
 def update_planet_positions(planets, dt):
     for planet in planets:
         planet['angle'] += planet['speed'] * dt * 0.001  # dt scaling for smoothness
@@ -49,4 +65,111 @@ def get_planet_positions(planet_data, sun_pos):
         })
     return planets
 
+# Orbits are a closed-form function of simulation time t (seconds):
+# angle(t) = angle0 + speed * ORBIT_RATE * t, matching update_planet_positions at 60 ticks/s.
+TICK_RATE = 60
+ORBIT_RATE = 0.001 * TICK_RATE
+
+
+def orbit_angle(angle0, speed, t):
+    return (angle0 + speed * ORBIT_RATE * t) % (2 * math.pi)
+
+
+def position_at(planet, t, sun_pos=SUN_POS):
+    """
+    Position of a PLANETS entry at simulation time t, treating planet["angle"] as its angle at t=0.
+    """
+    angle = orbit_angle(planet["angle"], planet["speed"], t)
+    return (sun_pos[0] + planet["orbit_radius"] * math.cos(angle),
+            sun_pos[1] + planet["orbit_radius"] * math.sin(angle))
+
+
+class PlanetTable:
+    """
+    Array-backed planet data: angle, speed, orbit radius and size live in contiguous arrays
+    so orbits for any number of bodies are evaluated in a few vectorized calls.
+    Angles are derived from simulation time, and positions are memoized per (time, sun_pos).
+    """
+    def __init__(self, planet_data):
+        self.names = [p["name"] for p in planet_data]
+        self.index = {name: i for i, name in enumerate(self.names)}
+        self.angle0 = np.array([p["angle"] for p in planet_data], dtype=np.float64)
+        self.angle = self.angle0.copy()
+        self.speed = np.array([p["speed"] for p in planet_data], dtype=np.float64)
+        self.orbit_radius = np.array([p["orbit_radius"] for p in planet_data], dtype=np.float64)
+        self.size = np.array([p["size"] for p in planet_data], dtype=np.int32)
+        self.time = 0.0
+        # Preallocated output buffers, overwritten by positions()
+        self.x = np.empty(len(self.names), dtype=np.float64)
+        self.y = np.empty(len(self.names), dtype=np.float64)
+        self._positions_key = None
+        # One Body per planet, updated in place by view()
+        self._view = [Body(p["name"], (0.0, 0.0), p["color"], p["material"], p["size"]) for p in planet_data]
+        self._view_key = None
+
+    def __len__(self):
+        return len(self.names)
+
+    def set_time(self, t):
+        if t == self.time:
+            return
+        self.time = t
+        np.multiply(self.speed, ORBIT_RATE * t, out=self.angle)
+        self.angle += self.angle0
+        np.mod(self.angle, 2 * math.pi, out=self.angle)
+
+    def update(self, dt):
+        # dt in ticks, same as update_planet_positions
+        self.set_time(self.time + dt / TICK_RATE)
+
+    def positions(self, sun_pos):
+        key = (self.time, sun_pos[0], sun_pos[1])
+        if key == self._positions_key:
+            return self.x, self.y
+        np.cos(self.angle, out=self.x)
+        self.x *= self.orbit_radius
+        self.x += sun_pos[0]
+        np.sin(self.angle, out=self.y)
+        self.y *= self.orbit_radius
+        self.y += sun_pos[1]
+        self._positions_key = key
+        return self.x, self.y
+
+    def positions_at(self, t, sun_pos=SUN_POS):
+        self.set_time(t)
+        return self.positions(sun_pos)
+
+    def position_at(self, name, t, sun_pos=SUN_POS):
+        # O(1) prediction for one body; does not move the table's current time
+        i = self.index[name]
+        angle = orbit_angle(float(self.angle0[i]), float(self.speed[i]), t)
+        radius = float(self.orbit_radius[i])
+        return (sun_pos[0] + radius * math.cos(angle), sun_pos[1] + radius * math.sin(angle))
+
+    def view(self, sun_pos):
+        """
+        Returns Bodies with the same fields as get_planet_positions' dicts, reused between calls.
+        """
+        xs, ys = self.positions(sun_pos)
+        key = self._positions_key
+        if key != self._view_key:
+            for planet, px, py in zip(self._view, xs.tolist(), ys.tolist()):
+                planet.pos = (px, py)
+            self._view_key = key
+        return self._view
+
+
+_ephemeris = None
+
+
+def positions_at(t, sun_pos=SUN_POS):
+    """
+    Batch positions (x array, y array) of all PLANETS at simulation time t, in PLANETS order.
+    The arrays are shared buffers: copy them if they must outlive the next call.
+    """
+    global _ephemeris
+    if _ephemeris is None:
+        _ephemeris = PlanetTable(PLANETS)
+    return _ephemeris.positions_at(t, sun_pos)
+
 # Add more planet-related helpers as needed
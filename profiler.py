@@ -0,0 +1,122 @@
+"""
+Lightweight per-section frame profiler.
+
+Wrap stages in `with profiler.section("name"):` between begin_frame() and end_frame(). While disabled, section() returns a shared
+no-op context, so instrumented code costs one method call per scope. While enabled, each
+section keeps a rolling window of durations for p50/p95/p99 and the frame total feeds the
+overlay graph (ui.draw_profiler_overlay). Stats can be exported as JSON or CSV.
+"""
+
+import csv
+import json
+import time
+from collections import deque
+
+FRAME = "frame"
+
+
+class _NullSection:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_SECTION = _NullSection()
+
+
+class _Section:
+    __slots__ = ("samples", "start")
+
+    def __init__(self, samples):
+        self.samples = samples
+        self.start = 0.0
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.samples.append((time.perf_counter() - self.start) * 1000.0)
+        return False
+
+
+def percentile(sorted_samples, p):
+    if not sorted_samples:
+        return 0.0
+    k = (len(sorted_samples) - 1) * p / 100.0
+    lo = int(k)
+    hi = min(lo + 1, len(sorted_samples) - 1)
+    return sorted_samples[lo] + (sorted_samples[hi] - sorted_samples[lo]) * (k - lo)
+
+
+class Profiler:
+    def __init__(self, window=300, enabled=False):
+        self.window = window
+        self.enabled = enabled
+        self._samples = {}   # name: deque of milliseconds
+        self._sections = {}  # name: reusable _Section
+        self._frame_start = None
+
+    def toggle(self):
+        self.enabled = not self.enabled
+        return self.enabled
+
+    def reset(self):
+        self._samples.clear()
+        self._sections.clear()
+
+    def section(self, name):
+        if not self.enabled:
+            return _NULL_SECTION
+        section = self._sections.get(name)
+        if section is None:
+            samples = deque(maxlen=self.window)
+            self._samples[name] = samples
+            section = _Section(samples)
+            self._sections[name] = section
+        return section
+
+    def begin_frame(self):
+        self._frame_start = time.perf_counter() if self.enabled else None
+
+    def end_frame(self):
+        # Frames that never reach end_frame (e.g. the blocking pause menu) are not recorded
+        if self._frame_start is None or not self.enabled:
+            return
+        self.section(FRAME).samples.append((time.perf_counter() - self._frame_start) * 1000.0)
+        self._frame_start = None
+
+    def frame_times(self):
+        return list(self._samples.get(FRAME, ()))
+
+    def stats(self):
+        """
+        {section: {"count", "mean", "p50", "p95", "p99", "max"}} in milliseconds over the window.
+        """
+        result = {}
+        for name, samples in list(self._samples.items()):  # Sections may be added from another thread
+            data = sorted(samples)
+            if not data:
+                continue
+            result[name] = {
+                "count": len(data),
+                "mean": sum(data) / len(data),
+                "p50": percentile(data, 50),
+                "p95": percentile(data, 95),
+                "p99": percentile(data, 99),
+                "max": data[-1],
+            }
+        return result
+
+    def export_json(self, path):
+        with open(path, "w") as f:
+            json.dump({"window": self.window, "sections": self.stats(), "frame_times": self.frame_times()}, f, indent=2)
+
+    def export_csv(self, path):
+        with open(path, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(["section", "count", "mean_ms", "p50_ms", "p95_ms", "p99_ms", "max_ms"])
+            for name, s in sorted(self.stats().items()):
+                writer.writerow([name, s["count"], f"{s['mean']:.4f}", f"{s['p50']:.4f}", f"{s['p95']:.4f}", f"{s['p99']:.4f}", f"{s['max']:.4f}"])
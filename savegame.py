@@ -0,0 +1,393 @@
+"""
+Versioned binary save files and background autosave.
+
+A save is a small header (magic, format version, payload size) followed by a zlib-compressed
+payload in a compact tagged encoding. snapshot() copies the game state into plain values on
+the thread that steps the game; encoding, compression and the file write can then happen on any thread.
+"""
+
+import os
+import queue
+import struct
+import threading
+import time
+import zlib
+from array import array
+
+import gamelog
+from game import Base
+from planets import SUN_POS
+from starfield import StarField
+from universe import Universe
+
+MAGIC = b"SPSV"
+VERSION = 1
+SAVE_PATH = "savegame.sav"
+AUTOSAVE_INTERVAL = 60.0  # Seconds of real time between autosaves
+COMPRESS_LEVEL = 6
+
+_HEADER = struct.Struct("<4sHI")  # magic, version, uncompressed payload size
+_U32 = struct.Struct("<I")
+_I64 = struct.Struct("<q")
+_F64 = struct.Struct("<d")
+
+log = gamelog.get_logger("save")
+
+
+class SaveError(ValueError):
+    """
+    Raised for files that are not saves, come from a newer version, or are corrupt.
+    """
+
+
+# --- ENCODING ---
+# Tags: N None, T/F bool, i int64, d float64, s str, l list, t tuple, m dict,
+# c counter (dict of str -> int, stored as one joined key string plus an int64 array)
+
+def _encode(value, out):
+    kind = type(value)
+    if value is None:
+        out += b"N"
+    elif kind is bool:
+        out += b"T" if value else b"F"
+    elif kind is int:
+        out += b"i"
+        out += _I64.pack(value)
+    elif kind is float:
+        out += b"d"
+        out += _F64.pack(value)
+    elif kind is str:
+        raw = value.encode("utf-8")
+        out += b"s"
+        out += _U32.pack(len(raw))
+        out += raw
+    elif kind is list or kind is tuple:
+        out += b"l" if kind is list else b"t"
+        out += _U32.pack(len(value))
+        for item in value:
+            _encode(item, out)
+    elif kind is dict:
+        if value and all(type(k) is str and "\0" not in k for k in value) and all(type(v) is int for v in value.values()):
+            # Inventories: one bulk string and one bulk array instead of a tag per entry
+            keys = "\0".join(value).encode("utf-8")
+            counts = array("q", value.values()).tobytes()
+            out += b"c"
+            out += _U32.pack(len(value))
+            out += _U32.pack(len(keys))
+            out += keys
+            out += counts
+        else:
+            out += b"m"
+            out += _U32.pack(len(value))
+            for k, v in value.items():
+                _encode(k, out)
+                _encode(v, out)
+    else:
+        raise TypeError(f"Cannot save value of type {kind.__name__}")
+
+
+def _decode(buf, pos):
+    tag = buf[pos]
+    pos += 1
+    if tag == 0x4E:  # N
+        return None, pos
+    if tag == 0x54:  # T
+        return True, pos
+    if tag == 0x46:  # F
+        return False, pos
+    if tag == 0x69:  # i
+        return _I64.unpack_from(buf, pos)[0], pos + 8
+    if tag == 0x64:  # d
+        return _F64.unpack_from(buf, pos)[0], pos + 8
+    if tag == 0x73:  # s
+        n = _U32.unpack_from(buf, pos)[0]
+        pos += 4
+        return bytes(buf[pos:pos + n]).decode("utf-8"), pos + n
+    if tag in (0x6C, 0x74):  # l, t
+        n = _U32.unpack_from(buf, pos)[0]
+        pos += 4
+        items = []
+        for _ in range(n):
+            item, pos = _decode(buf, pos)
+            items.append(item)
+        return (items if tag == 0x6C else tuple(items)), pos
+    if tag == 0x6D:  # m
+        n = _U32.unpack_from(buf, pos)[0]
+        pos += 4
+        result = {}
+        for _ in range(n):
+            k, pos = _decode(buf, pos)
+            v, pos = _decode(buf, pos)
+            result[k] = v
+        return result, pos
+    if tag == 0x63:  # c
+        n, size = _U32.unpack_from(buf, pos)[0], _U32.unpack_from(buf, pos + 4)[0]
+        pos += 8
+        keys = bytes(buf[pos:pos + size]).decode("utf-8").split("\0")
+        pos += size
+        counts = array("q")
+        counts.frombytes(buf[pos:pos + 8 * n])
+        return dict(zip(keys, counts.tolist())), pos + 8 * n
+    raise SaveError(f"Unknown tag {tag:#x} at offset {pos - 1}")
+
+
+def dumps(snap, level=COMPRESS_LEVEL):
+    out = bytearray()
+    _encode(snap, out)
+    return _HEADER.pack(MAGIC, VERSION, len(out)) + zlib.compress(bytes(out), level)
+
+
+def loads(blob):
+    if len(blob) < _HEADER.size:
+        raise SaveError("Save file is truncated")
+    magic, version, size = _HEADER.unpack_from(blob, 0)
+    if magic != MAGIC:
+        raise SaveError("Not a save file")
+    if version > VERSION:
+        raise SaveError(f"Save format {version} is newer than supported ({VERSION})")
+    try:
+        payload = zlib.decompress(memoryview(blob)[_HEADER.size:])
+    except zlib.error as e:
+        raise SaveError(f"Corrupt save: {e}") from None
+    if len(payload) != size:
+        raise SaveError("Corrupt save: payload size mismatch")
+    snap, _ = _decode(memoryview(payload), 0)
+    return snap
+
+
+# --- GAME STATE ---
+def snapshot(game):
+    """
+    Copies everything needed to resume into plain values. Cheap enough to run between steps:
+    containers are shallow-copied and quest content is stored as progress only.
+    """
+    state = game.state
+    player = state.player
+    return {
+        "sim_time": game.sim_time,
+        "ticks": game.ticks,
+        "star_seed": game.starfield.seed,
+        "ship": (game.player_x, game.player_y, game.player_angle, game.player_speed, game.player_size),
+        "landed": (game.landed_planet.name, game.landed_angle) if game.landed_planet is not None else None,
+        "collect_progress": game._collect_progress,
+        "hyperjump": (game.in_hyperjump, game.hyperjump_timer),
+        "end_game": game.end_game,
+        "quests": [(q.collected, q.completed) for q in state.quests],
+        "current_quest": state.current_quest,
+        "current_system": state.current_system,
+        "active": list(state._active),
+        "game_completed": state.game_completed,
+        "bases": {name: dict(base) for name, base in state.bases.items()},
+        "revenue": state.revenue,
+        "tech": {name: upgrade["level"] for name, upgrade in state.tech_upgrades.items()},
+        "inventory": dict(state.inventory),
+        "universe": dict(game.universe.progress) if game.universe is not None else None,
+        "player": {
+            "x": player.x, "y": player.y, "health": player.health, "fuel": player.fuel,
+            "angle": player.angle, "base_built": player.base_built,
+            "inventory": dict(player.inventory),
+            "bases": {name: dict(base) if type(base) is dict else base for name, base in player.bases.items()},
+            "tech_tree": dict(player.tech_tree),
+        },
+    }
+
+
+_NUMBER = (int, float)
+_PAIR = (list, tuple)
+
+
+def _expect(ok, what):
+    if not ok:
+        raise SaveError(f"Corrupt save: bad {what}")
+
+
+def _field(data, key, types, where=""):
+    _expect(key in data and isinstance(data[key], types), where + key)
+    return data[key]
+
+
+def _counts(data, key, where=""):
+    # A dict of name -> int, such as an inventory
+    value = _field(data, key, dict, where)
+    _expect(all(type(k) is str and type(v) is int for k, v in value.items()), where + key)
+    return value
+
+
+def validate(snap, game=None):
+    """
+    Checks that a decoded snapshot has the shape restore() expects (and, given a game, that it
+    fits that game's quest list). Raises SaveError otherwise.
+    """
+    _expect(type(snap) is dict, "snapshot")
+    for key in ("sim_time", "collect_progress", "revenue"):
+        _field(snap, key, _NUMBER)
+    for key in ("ticks", "star_seed", "current_quest", "current_system"):
+        _field(snap, key, int)
+    for key in ("end_game", "game_completed"):
+        _field(snap, key, bool)
+    ship = _field(snap, "ship", _PAIR)
+    _expect(len(ship) == 5 and all(isinstance(v, _NUMBER) for v in ship), "ship")
+    landed = _field(snap, "landed", _PAIR + (type(None),))
+    _expect(landed is None or (len(landed) == 2 and type(landed[0]) is str and isinstance(landed[1], _NUMBER)), "landed")
+    hyperjump = _field(snap, "hyperjump", _PAIR)
+    _expect(len(hyperjump) == 2 and type(hyperjump[0]) is bool and isinstance(hyperjump[1], _NUMBER), "hyperjump")
+    quests = _field(snap, "quests", list)
+    _expect(all(isinstance(q, _PAIR) and len(q) == 2 and type(q[0]) is int and type(q[1]) is bool for q in quests), "quests")
+    active = _field(snap, "active", list)
+    _expect(all(type(i) is int for i in active), "active")
+    bases = _field(snap, "bases", dict)
+    _expect(all(type(name) is str and type(base) is dict for name, base in bases.items()), "bases")
+    _counts(snap, "tech")
+    _counts(snap, "inventory")
+    universe = _field(snap, "universe", (dict, type(None)))
+    _expect(universe is None or all(isinstance(v, list) for v in universe.values()), "universe")
+    player = _field(snap, "player", dict)
+    for key in ("x", "y", "health", "fuel", "angle"):
+        _field(player, key, _NUMBER, "player.")
+    _field(player, "base_built", bool, "player.")
+    _field(player, "bases", dict, "player.")
+    _counts(player, "inventory", "player.")
+    _field(player, "tech_tree", dict, "player.")
+    if game is not None:
+        state = game.state
+        if len(quests) != len(state.quests):
+            raise SaveError("Save was made with a different quest list")
+        _expect(len(active) == len(state.system_ranges) and 0 <= snap["current_system"] < len(state.system_ranges),
+                "quest systems")
+
+
+def restore(game, snap):
+    """
+    Applies a snapshot to a freshly constructed Game. The snapshot is validated first, so a bad
+    save raises SaveError without changing the game.
+    """
+    validate(snap, game)
+    state = game.state
+    player = state.player
+    for quest, (collected, completed) in zip(state.quests, snap["quests"]):
+        quest.collected = collected
+        quest.completed = completed
+    state.current_quest = snap["current_quest"]
+    state.current_system = snap["current_system"]
+    state._active = list(snap["active"])
+    state.game_completed = snap["game_completed"]
+    state.events = []
+    state.bases = {name: Base.from_dict(base) for name, base in snap["bases"].items()}
+    state.revenue = snap["revenue"]
+    for name, level in snap["tech"].items():
+        if name in state.tech_upgrades:
+            state.tech_upgrades[name]["level"] = level
+    state.inventory = snap["inventory"]
+    p = snap["player"]
+    player.x, player.y = p["x"], p["y"]
+    player.rect.topleft = (player.x, player.y)
+    player.health, player.fuel, player.angle = p["health"], p["fuel"], p["angle"]
+    player.base_built = p["base_built"]
+    player.inventory = p["inventory"]
+    player.bases = p["bases"]
+    player.tech_tree = p["tech_tree"]
+
+    if snap["star_seed"] != game.starfield.seed:
+        game.starfield = StarField(seed=snap["star_seed"])
+    if game.universe is not None:
+        # Generated systems follow the star seed; only their quest progress is saved
+        game.universe = Universe(seed=snap["star_seed"])
+        game.universe.progress = dict(snap.get("universe") or {})
+    game.sim_time = snap["sim_time"]
+    game.ticks = snap["ticks"]
+    game.planet_table.set_time(game.sim_time)
+    game.reset_entities()  # Traders and shots are not saved; traders respawn around the planets
+    game.planets = game.planet_table.view(SUN_POS)
+    game.player_x, game.player_y, game.player_angle, game.player_speed, game.player_size = snap["ship"]
+    game.local_systems = []
+    if game.universe is not None:
+        game._stream_systems()
+    game.proximity.rebuild(game.planets)
+    game.landed_planet, game.landed_angle = None, None
+    if snap["landed"] is not None:
+        name, angle = snap["landed"]
+        i = game.planet_table.index.get(name)
+        if i is not None:
+            game.landed_planet, game.landed_angle = game.planets[i], angle
+    game._collect_progress = snap["collect_progress"]
+    game.in_hyperjump, game.hyperjump_timer = snap["hyperjump"]
+    game.end_game = snap["end_game"]
+    # No interpolation across the load
+    game.prev_time = game.sim_time
+    game.prev_x, game.prev_y, game.prev_angle = game.player_x, game.player_y, game.player_angle
+    game.accumulator = 0.0
+    game._update_marker()
+    game.invalidate()
+
+
+def write_file(path, blob):
+    # Write then rename, so a crash mid-write never leaves a torn save
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(blob)
+    os.replace(tmp, path)
+
+
+def save(game, path=SAVE_PATH):
+    write_file(path, dumps(snapshot(game)))
+
+
+def load(game, path=SAVE_PATH):
+    with open(path, "rb") as f:
+        restore(game, loads(f.read()))
+
+
+class Autosaver:
+    """
+    Takes snapshots on the caller's thread and hands them to a worker thread that encodes,
+    compresses and writes them. Only the newest pending snapshot is kept, so a slow disk
+    drops intermediate saves instead of queueing them.
+    """
+    def __init__(self, path=SAVE_PATH, interval=AUTOSAVE_INTERVAL):
+        self.path = path
+        self.interval = interval
+        self.last_save = time.monotonic()
+        self.saves = 0
+        self._pending = queue.Queue(maxsize=1)
+        self._thread = threading.Thread(target=self._run, name="autosave", daemon=True)
+        self._thread.start()
+
+    def tick(self, game, now=None):
+        """
+        Called once per frame; saves when the interval has passed. Returns True if it did.
+        """
+        now = time.monotonic() if now is None else now
+        if now - self.last_save < self.interval:
+            return False
+        self.save_now(game)
+        return True
+
+    def save_now(self, game):
+        self.last_save = time.monotonic()
+        snap = snapshot(game)
+        try:
+            self._pending.get_nowait()  # Replace a snapshot the worker has not picked up yet
+        except queue.Empty:
+            pass
+        self._pending.put(snap)
+
+    def _run(self):
+        while True:
+            snap = self._pending.get()
+            if snap is None:
+                return
+            try:
+                write_file(self.path, dumps(snap))
+                self.saves += 1
+                log.info("Autosaved to %s", self.path)
+            except OSError as e:
+                log.warning("Autosave to %s failed: %s", self.path, e)
+
+    def close(self, game=None):
+        """
+        Optionally saves one last time, then waits for the worker to finish writing.
+        """
+        if game is not None:
+            self.save_now(game)
+        self._pending.put(None)
+        self._thread.join()
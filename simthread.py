@@ -0,0 +1,185 @@
+"""
+Runs the simulation on a worker thread, decoupled from rendering.
+
+The render loop pushes one Inputs per frame onto a deque (appends and pops are atomic, so
+neither side takes a lock) and draws the latest published Snapshot. Snapshots are double
+buffered: two preallocated buffers, one published (front) and one the worker refills after
+each step (back) before swapping the published reference. The renderer holds the front it is
+drawing with acquire()/release(); if the worker would refill the buffer the renderer still
+holds (it stepped twice during one frame), it skips that publish instead of waiting, so the
+renderer always sees one complete step and neither side blocks. Everything else that touches
+the Game while the thread runs (saving, closing the menu) goes through call() and runs on the
+worker between steps. If the worker crashes, the error is logged and re-raised on the render
+thread by the next acquire(), push() or call().
+
+The threads still share the interpreter lock, so this keeps slow ticks from delaying frames
+rather than running both at once; the NumPy systems release the lock while they work.
+"""
+
+import threading
+import time
+from collections import deque
+
+import gamelog
+
+MAX_FRAME_TIME = 0.25  # Seconds; longer gaps (a stalled thread, a suspended machine) are clamped
+COMMAND_TIMEOUT = 5.0  # Seconds call(wait=True) waits for the worker
+
+log = gamelog.get_logger("physics")
+
+
+class SimulationThread:
+    """
+    Owns the Game between start() and stop(); until then it may be used directly. after_step
+    is called on the worker with the game after every advance, e.g. for autosave.
+    """
+    def __init__(self, game, after_step=None):
+        self.game = game
+        self.after_step = after_step
+        self._buffers = (game.new_snapshot(), game.new_snapshot())
+        self.snapshot = game.snapshot(self._buffers[0])  # Front buffer: the latest published state
+        self._reading = None  # Buffer the renderer holds, never refilled while held
+        self.steps = 0
+        self.skipped = 0  # Publishes skipped because the renderer still held the back buffer
+        self._inputs = deque()
+        self._commands = deque()
+        self._running = False
+        self._thread = None
+        self.error = None  # Exception that stopped the worker
+
+    def start(self):
+        self._running = True
+        self._thread = threading.Thread(target=self._run, name="simulation", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """
+        Finishes the current step and joins the worker; the Game belongs to the caller again.
+        """
+        self._running = False
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self._run_commands()
+
+    def push(self, inputs):
+        # One Inputs per rendered frame; the worker merges whatever piled up since its last step
+        self._check()
+        self._inputs.append(inputs)
+
+    def call(self, command, wait=False):
+        """
+        Runs command(game) on the worker before its next step and returns a threading.Event set
+        once it ran and a snapshot including its effect was published. With wait, blocks until
+        then instead, raising TimeoutError after COMMAND_TIMEOUT seconds.
+        """
+        self._check()
+        done = threading.Event()
+        self._commands.append((command, done))
+        if self._thread is None:
+            self._run_commands()
+        if wait:
+            finished = done.wait(COMMAND_TIMEOUT)
+            self._check()
+            if not finished:
+                raise TimeoutError("The simulation thread did not run the command in time")
+        return done
+
+    def acquire(self):
+        """
+        The latest published Snapshot, held for drawing until release().
+        """
+        self._check()
+        while True:
+            snap = self.snapshot
+            self._reading = snap
+            if self.snapshot is snap:  # Not swapped before the hold was visible to the worker
+                return snap
+
+    def release(self):
+        self._reading = None
+
+    def _check(self):
+        # Re-raises a worker crash on the calling thread
+        if self.error is not None:
+            raise self.error
+
+    def alpha(self, snap):
+        # Render blend for a snapshot: its own alpha plus the real time since it was published
+        return min(1.0, snap.alpha + (time.perf_counter() - snap.time) * self.game.sim_rate)
+
+    def _take_inputs(self):
+        inputs = None
+        queue = self._inputs
+        while queue:
+            newer = queue.popleft()
+            inputs = newer if inputs is None else inputs.merge(newer)
+        return inputs
+
+    def _run_commands(self):
+        ran = []
+        while self._commands:
+            command, done = self._commands.popleft()
+            try:
+                command(self.game)
+            except Exception:
+                log.exception("Simulation command failed")
+            ran.append(done)
+        if ran:
+            self._publish(wait=True)
+            for done in ran:
+                done.set()
+
+    def _publish(self, wait=False):
+        # Refills the back buffer and swaps it to the front. Returns False if the renderer still
+        # holds the back buffer; with wait, waits for it to release the buffer instead.
+        front, back = self._buffers
+        if self.snapshot is back:
+            front, back = back, front
+        while self._reading is back:
+            if not wait:
+                self.skipped += 1
+                return False
+            time.sleep(0.001)
+        self.snapshot = self.game.snapshot(back)
+        return True
+
+    def _run(self):
+        try:
+            self._loop()
+        except Exception as e:
+            log.exception("Simulation thread stopped")
+            self.error = e
+            while self._commands:  # Wake callers waiting on commands that will never run
+                self._commands.popleft()[1].set()
+
+    def _loop(self):
+        game = self.game
+        prof = game.profiler
+        step_dt = 1 / game.sim_rate
+        last = time.perf_counter()
+        inputs = None
+        while self._running:
+            self._run_commands()
+            now = time.perf_counter()
+            frame_dt, last = min(now - last, MAX_FRAME_TIME), now
+            if game.state.menu_open:
+                # Paused: input meant for the game is dropped and time does not pass
+                self._inputs.clear()
+                time.sleep(step_dt)
+                continue
+            newer = self._take_inputs()
+            if newer is not None:
+                inputs = newer
+            elif inputs is not None:
+                inputs = inputs.held()  # Presses apply once; held controls stay until the next frame
+            if inputs is None:
+                time.sleep(step_dt)
+                continue
+            with prof.section("simulation"):
+                self.steps += game.advance(inputs, frame_dt)
+            if self.after_step is not None:
+                self.after_step(game)
+            with prof.section("snapshot"):
+                self._publish()
+            time.sleep(max(0.0, step_dt - game.accumulator))
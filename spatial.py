@@ -0,0 +1,91 @@
+"""
+Broad-phase spatial index for proximity queries (landing, collection, interaction).
+"""
+
+import math
+
+
+class SpatialGrid:
+    """
+    Uniform grid over world space. Bodies are records with pos and radius attributes (like
+    planets.Body) and are stored in every cell their bounding box touches.
+    """
+    def __init__(self, cell_size=1024):
+        self.cell_size = cell_size
+        self.cells = {}
+        self.bodies = []
+        self._bounds = None  # (min_cx, min_cy, max_cx, max_cy) of occupied cells
+
+    def rebuild(self, bodies):
+        size = self.cell_size
+        cells = {}
+        min_cx = min_cy = math.inf
+        max_cx = max_cy = -math.inf
+        for body in bodies:
+            x, y = body.pos
+            r = body.radius
+            cx0, cx1 = int((x - r) // size), int((x + r) // size)
+            cy0, cy1 = int((y - r) // size), int((y + r) // size)
+            for cy in range(cy0, cy1 + 1):
+                for cx in range(cx0, cx1 + 1):
+                    cell = cells.get((cx, cy))
+                    if cell is None:
+                        cells[(cx, cy)] = [body]
+                    else:
+                        cell.append(body)
+            min_cx, min_cy = min(min_cx, cx0), min(min_cy, cy0)
+            max_cx, max_cy = max(max_cx, cx1), max(max_cy, cy1)
+        self.cells = cells
+        self.bodies = list(bodies)
+        self._bounds = (min_cx, min_cy, max_cx, max_cy) if bodies else None
+
+    def bodies_within(self, x, y, r):
+        """
+        Bodies whose surface is closer than r to (x, y), i.e. hypot(dx, dy) < radius + r,
+        nearest surface first.
+        """
+        size = self.cell_size
+        found = []
+        seen = set()
+        for cy in range(int((y - r) // size), int((y + r) // size) + 1):
+            for cx in range(int((x - r) // size), int((x + r) // size) + 1):
+                for body in self.cells.get((cx, cy), ()):
+                    if id(body) in seen:
+                        continue
+                    seen.add(id(body))
+                    bx, by = body.pos
+                    gap = math.hypot(x - bx, y - by) - body.radius
+                    if gap < r:
+                        found.append((gap, len(found), body))
+        found.sort()
+        return [body for _, _, body in found]
+
+    def nearest_body(self, x, y, max_dist=math.inf):
+        """
+        Returns (body, surface distance) of the body nearest to (x, y), or (None, inf).
+        Searches outward ring by ring and stops once no unvisited cell can hold a closer body.
+        """
+        if self._bounds is None:
+            return None, math.inf
+        size = self.cell_size
+        pcx, pcy = int(x // size), int(y // size)
+        min_cx, min_cy, max_cx, max_cy = self._bounds
+        max_ring = max(pcx - min_cx, max_cx - pcx, pcy - min_cy, max_cy - pcy)
+        best, best_gap = None, math.inf
+        for ring in range(0, max_ring + 1):
+            # Every body not yet seen is at least (ring - 1) cells away
+            if best_gap <= (ring - 1) * size or (ring - 1) * size > max_dist:
+                break
+            for cy in range(pcy - ring, pcy + ring + 1):
+                edge = cy in (pcy - ring, pcy + ring)
+                for cx in range(pcx - ring, pcx + ring + 1):
+                    if not edge and cx not in (pcx - ring, pcx + ring):
+                        continue
+                    for body in self.cells.get((cx, cy), ()):
+                        bx, by = body.pos
+                        gap = math.hypot(x - bx, y - by) - body.radius
+                        if gap < best_gap:
+                            best, best_gap = body, gap
+        if best_gap > max_dist:
+            return None, math.inf
+        return best, best_gap
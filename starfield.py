@@ -0,0 +1,56 @@
+"""
+Seeded, chunked star field: stars are generated per grid cell on demand so the whole world is covered.
+"""
+
+import random
+from collections import OrderedDict
+
+# Each layer: (parallax factor, stars per cell, star radius). 1.0 moves with the camera.
+DEFAULT_LAYERS = [(1.0, 5, 6)]
+
+
+class StarField:
+    def __init__(self, seed=0, cell_size=512, layers=None, max_chunks=256):
+        self.seed = seed
+        self.cell_size = cell_size
+        self.layers = list(layers) if layers is not None else list(DEFAULT_LAYERS)
+        self.max_chunks = max_chunks
+        self._chunks = OrderedDict()  # (layer, cx, cy): [(x, y), ...]
+
+    def _chunk(self, layer, cx, cy):
+        key = (layer, cx, cy)
+        stars = self._chunks.get(key)
+        if stars is not None:
+            self._chunks.move_to_end(key)
+            return stars
+        # Same seed and cell always give the same stars, so evicted chunks regenerate identically
+        rng = random.Random((self.seed * 1000003 + layer) * 2654435761 ^ cx * 73856093 ^ cy * 19349663)
+        size = self.cell_size
+        x0, y0 = cx * size, cy * size
+        count = self.layers[layer][1]
+        stars = [(x0 + rng.randrange(size), y0 + rng.randrange(size)) for _ in range(count)]
+        self._chunks[key] = stars
+        if len(self._chunks) > self.max_chunks:
+            self._chunks.popitem(last=False)
+        return stars
+
+    def visible(self, cam_x, cam_y, width, height):
+        """
+        Returns (x, y, radius) for stars in the cells overlapping the camera.
+        x, y are in world space for the main camera (screen pos = x - cam_x, y - cam_y),
+        with parallax already applied for deeper layers.
+        """
+        result = []
+        size = self.cell_size
+        for layer, (factor, _, radius) in enumerate(self.layers):
+            lx, ly = cam_x * factor, cam_y * factor
+            shift_x, shift_y = cam_x - lx, cam_y - ly
+            for cy in range(int(ly // size), int((ly + height) // size) + 1):
+                for cx in range(int(lx // size), int((lx + width) // size) + 1):
+                    for sx, sy in self._chunk(layer, cx, cy):
+                        if lx <= sx <= lx + width and ly <= sy <= ly + height:
+                            result.append((int(sx + shift_x), int(sy + shift_y), radius))
+        return result
+
+    def chunk_count(self):
+        return len(self._chunks)
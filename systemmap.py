@@ -0,0 +1,197 @@
+"""
+Zoomable system map: a cached static layer (background, sun, orbit rings, system names)
+and a thin dynamic layer (body dots, decluttered labels, player) drawn on top each frame.
+"""
+
+import math
+import numpy as np
+import pygame
+from assets import WHITE, SUN_COLOR, SUN_POS, render_text
+
+MIN_ZOOM = 1.0   # 1.0 fits the outermost orbit in the map
+MAX_ZOOM = 64.0
+ZOOM_STEP = 1.25
+MAX_LABELS = 40  # Label budget per frame; at most 4x this many candidates are tried
+RING_GAP = 3     # Orbit rings closer than this many pixels to the previous ring are skipped
+
+
+class SystemMap:
+    """
+    Map view over any number of bodies orbiting one sun. View state is a zoom factor and a
+    center offset from the sun in world units; the static layer is rebuilt only when it changes.
+    systems is a list of (name, [body names]) used for ring highlighting and focus().
+    """
+    def __init__(self, planet_data, size=(350, 350), systems=None, sun_pos=SUN_POS):
+        self.size = size
+        self.sun_pos = sun_pos
+        self.names = [p["name"] for p in planet_data]
+        self.index = {name: i for i, name in enumerate(self.names)}
+        self.orbit_radius = np.array([p["orbit_radius"] for p in planet_data], dtype=np.float64)
+        self.colors = [tuple(p["color"]) for p in planet_data]
+        # Label priority: bigger bodies first
+        self.priority = np.argsort([-p["size"] for p in planet_data], kind="stable")
+        self.max_orbit = float(self.orbit_radius.max()) if len(self.names) else 1.0
+        self.base_scale = (size[0] // 2 - 24) / self.max_orbit
+        self.systems = []
+        for name, members in (systems or []):
+            radii = [self.orbit_radius[self.index[m]] for m in members if m in self.index]
+            if radii:
+                self.systems.append((name, min(radii), max(radii)))
+        self.zoom = MIN_ZOOM
+        self.center = (0.0, 0.0)
+        self.focused = None
+        self._static_key = None
+        self._static = None
+        self._background = None
+        self._surface = None
+        self._mapped = None
+
+    @property
+    def scale(self):
+        return self.base_scale * self.zoom
+
+    # --- VIEW CONTROL ---
+    def zoom_by(self, steps):
+        # Positive steps zoom out, matching the mouse wheel scroll direction
+        if steps:
+            self.zoom = max(MIN_ZOOM, min(MAX_ZOOM, self.zoom * ZOOM_STEP ** -steps))
+            self._clamp_center()
+
+    def pan(self, dx, dy):
+        # dx, dy in map pixels
+        if dx or dy:
+            self.center = (self.center[0] + dx / self.scale, self.center[1] + dy / self.scale)
+            self._clamp_center()
+
+    def focus(self, system):
+        """
+        Frames a system's orbit band around the sun; None shows everything.
+        """
+        self.focused = system
+        self.center = (0.0, 0.0)
+        if system is None or not (0 <= system < len(self.systems)):
+            self.focused = None
+            self.zoom = MIN_ZOOM
+            return
+        _, _, outer = self.systems[system]
+        self.zoom = max(MIN_ZOOM, min(MAX_ZOOM, self.max_orbit / outer))
+
+    def _clamp_center(self):
+        limit = self.max_orbit
+        self.center = (max(-limit, min(limit, self.center[0])), max(-limit, min(limit, self.center[1])))
+
+    def to_map(self, x, y):
+        """
+        World position(s) to map pixels; works on scalars and numpy arrays.
+        """
+        scale = self.scale
+        w, h = self.size
+        return ((x - self.sun_pos[0] - self.center[0]) * scale + w // 2,
+                (y - self.sun_pos[1] - self.center[1]) * scale + h // 2)
+
+    # --- LAYERS ---
+    def _background_layer(self):
+        if self._background is None:
+            w, h = self.size
+            layer = pygame.Surface((w, h))
+            for y in range(h):
+                c = int(20 + 30 * (y / h))
+                pygame.draw.line(layer, (c, c, 48), (0, y), (w, y))
+            self._background = layer
+        return self._background
+
+    def _static_layer(self):
+        key = (self.zoom, self.center, self.focused)
+        if key == self._static_key:
+            return self._static
+        w, h = self.size
+        layer = self._background_layer().copy()
+        sun_mx, sun_my = self.to_map(*self.sun_pos)
+        sun_mx, sun_my = int(sun_mx), int(sun_my)
+        scale = self.scale
+        # Orbit rings, one per distinct radius, thinned where they would merge at this zoom
+        half_diag = math.hypot(w, h) / 2
+        dist_to_center = math.hypot(sun_mx - w // 2, sun_my - h // 2)
+        last = -RING_GAP
+        for radius in np.unique(self.orbit_radius).tolist():
+            r = int(radius * scale)
+            if r - last < RING_GAP or r < dist_to_center - half_diag or r > dist_to_center + half_diag:
+                continue
+            pygame.draw.circle(layer, (48, 56, 88), (sun_mx, sun_my), r, 1)
+            last = r
+        # Highlight the focused system's band and name each system at its outer ring
+        for i, (name, inner, outer) in enumerate(self.systems):
+            color = (120, 180, 255) if i == self.focused else (90, 110, 160)
+            if i == self.focused:
+                pygame.draw.circle(layer, color, (sun_mx, sun_my), int(inner * scale), 1)
+                pygame.draw.circle(layer, color, (sun_mx, sun_my), int(outer * scale), 1)
+            label = render_text(name, 14, color)
+            ly = sun_my - int(outer * scale) - label.get_height()
+            if 0 <= ly < h - label.get_height():
+                layer.blit(label, (sun_mx - label.get_width() // 2, ly))
+        sun_r = max(3, min(40, int(14 * self.zoom ** 0.5)))
+        pygame.draw.circle(layer, SUN_COLOR, (sun_mx, sun_my), sun_r)
+        layer.blit(render_text("Sun", 18, WHITE), (sun_mx - 10, sun_my - sun_r - 10))
+        self._static = layer
+        self._static_key = key
+        return layer
+
+    # --- DRAWING ---
+    def draw(self, screen, pos, xs, ys, player_pos, marker=None):
+        """
+        Draws the map with its top-left at pos. xs, ys are body world positions in planet_data
+        order; marker is the name of a body whose label always wins the declutter pass.
+        """
+        w, h = self.size
+        if self._surface is None:
+            self._surface = pygame.Surface((w, h))
+        surf = self._surface
+        surf.blit(self._static_layer(), (0, 0))
+
+        mx, my = self.to_map(xs, ys)
+        visible = np.flatnonzero((mx >= -8) & (mx < w + 8) & (my >= -8) & (my < h + 8))
+        # LOD: dot size shrinks as the visible count grows; one dot per occupied dot-sized cell
+        count = len(visible)
+        dot = 7 if count <= 64 else 3 if count <= 1024 else 1
+        cell = dot * 2
+        cells = (mx[visible] // cell).astype(np.int64) * 4096 + (my[visible] // cell).astype(np.int64)
+        _, first = np.unique(cells, return_index=True)
+        drawn = visible[np.sort(first)]
+        if dot == 1:
+            # Densest level: plot single pixels in one vectorized write
+            px = mx[drawn].astype(np.int64)
+            py = my[drawn].astype(np.int64)
+            inside = (px >= 0) & (px < w) & (py >= 0) & (py < h)
+            if self._mapped is None:
+                self._mapped = np.array([surf.map_rgb(c) for c in self.colors], dtype=np.uint32)
+            pixels = pygame.surfarray.pixels2d(surf)
+            pixels[px[inside], py[inside]] = self._mapped[drawn[inside]]
+            del pixels
+        else:
+            for i, px, py in zip(drawn.tolist(), mx[drawn].tolist(), my[drawn].tolist()):
+                pygame.draw.circle(surf, self.colors[i], (int(px), int(py)), dot)
+
+        # Labels: marker first, then by body size, skipping any that would overlap a placed one
+        is_drawn = np.zeros(len(self.names), dtype=bool)
+        is_drawn[drawn] = True
+        order = self.priority[is_drawn[self.priority]][:MAX_LABELS * 4].tolist()
+        marker_i = self.index.get(marker)
+        if marker_i is not None and is_drawn[marker_i]:
+            if marker_i in order:
+                order.remove(marker_i)
+            order.insert(0, marker_i)
+        placed = []
+        for i in order:
+            if len(placed) >= MAX_LABELS:
+                break
+            label = render_text(self.names[i], 16, (255, 255, 0) if i == marker_i else WHITE)
+            rect = label.get_rect(topleft=(int(mx[i]) - 10, int(my[i]) - 18))
+            if rect.collidelist(placed) != -1:
+                continue
+            surf.blit(label, rect)
+            placed.append(rect)
+
+        # Player position on map
+        pmx, pmy = self.to_map(*player_pos)
+        pygame.draw.circle(surf, (0, 255, 0), (int(pmx), int(pmy)), 5)
+        return screen.blit(surf, pos)
@@ -1,15 +1,14 @@
 """
 Handles all UI drawing functions: menus, quest bar, health/fuel bars, buttons, tech tree, etc.
 """
+import math
 import pygame
-from assets import WHITE, BLACK, get_font
+from assets import WHITE, BLACK, render_text, get_rotation_cache
 
 def draw_start_menu(screen):
     screen.fill(BLACK)
-    font_big = get_font(64)
-    font_small = get_font(32)
-    title = font_big.render("Space Explorer", True, WHITE)
-    prompt = font_small.render("Press ENTER to Start", True, WHITE)
+    title = render_text("Space Explorer", 64, WHITE)
+    prompt = render_text("Press ENTER to Start", 32, WHITE)
     controls = [
         "Controls:",
         "Arrow keys / WASD - Move & Rotate",
@@ -20,41 +19,42 @@ def draw_start_menu(screen):
     screen.blit(title, (screen.get_width() // 2 - title.get_width() // 2, screen.get_height() // 2 - 120))
     screen.blit(prompt, (screen.get_width() // 2 - prompt.get_width() // 2, screen.get_height() // 2 - 40))
     for i, line in enumerate(controls):
-        ctrl = font_small.render(line, True, WHITE)
+        ctrl = render_text(line, 32, WHITE)
         screen.blit(ctrl, (screen.get_width() // 2 - ctrl.get_width() // 2, screen.get_height() // 2 + 30 + i * 30))
     pygame.display.flip()
 
-def draw_game_menu(screen, selected=None, show_controls=False):
-    menu_width, menu_height = 400, 320
-    menu_x = screen.get_width() // 2 - menu_width // 2 - 100
-    menu_y = screen.get_height() // 2 - menu_height // 2
-    menu_panel = pygame.Surface((menu_width, menu_height), pygame.SRCALPHA)
-    menu_panel.fill((30, 30, 60, 240))
-    pygame.draw.rect(menu_panel, (80, 80, 120, 255), (0, 0, menu_width, menu_height), border_radius=18)
-    font = get_font(48)
-    title = font.render("Game Menu", True, (255,255,255))
-    menu_panel.blit(title, (menu_width//2 - title.get_width()//2, 30))
-    font_btn = get_font(36)
-    btns = ["Resume", "Controls", "Quit"]
-    btn_rects = []
-    for i, btn in enumerate(btns):
-        color = (255,255,120) if selected == i else (220,220,255)
-        btn_surf = font_btn.render(btn, True, color)
-        bx = menu_width//2 - btn_surf.get_width()//2
-        by = 100 + i*60
-        menu_panel.blit(btn_surf, (bx, by))
-        btn_rects.append(pygame.Rect(menu_x+bx, menu_y+by, btn_surf.get_width(), btn_surf.get_height()))
-    screen.blit(menu_panel, (menu_x, menu_y))
-    # Draw controls panel to the right if needed
-    if show_controls:
-        ctrl_width, ctrl_height = 340, 320
-        ctrl_x = menu_x + menu_width + 20
-        ctrl_y = menu_y + 20
+# Menu panels are built once per state; the menu only changes on hover or the controls toggle
+_menu_panels = {}
+
+def _game_menu_panel(selected, menu_width, menu_height):
+    key = ("menu", selected, menu_width, menu_height)
+    cached = _menu_panels.get(key)
+    if cached is None:
+        menu_panel = pygame.Surface((menu_width, menu_height), pygame.SRCALPHA)
+        menu_panel.fill((30, 30, 60, 240))
+        pygame.draw.rect(menu_panel, (80, 80, 120, 255), (0, 0, menu_width, menu_height), border_radius=18)
+        title = render_text("Game Menu", 48, (255,255,255))
+        menu_panel.blit(title, (menu_width//2 - title.get_width()//2, 30))
+        btns = ["Resume", "Controls", "Quit"]
+        btn_rects = []
+        for i, btn in enumerate(btns):
+            color = (255,255,120) if selected == i else (220,220,255)
+            btn_surf = render_text(btn, 36, color)
+            bx = menu_width//2 - btn_surf.get_width()//2
+            by = 100 + i*60
+            menu_panel.blit(btn_surf, (bx, by))
+            btn_rects.append(pygame.Rect(bx, by, btn_surf.get_width(), btn_surf.get_height()))
+        cached = _menu_panels[key] = (menu_panel, btn_rects)
+    return cached
+
+def _controls_panel(ctrl_width, ctrl_height):
+    key = ("controls", ctrl_width, ctrl_height)
+    ctrl_panel = _menu_panels.get(key)
+    if ctrl_panel is None:
         ctrl_panel = pygame.Surface((ctrl_width, ctrl_height), pygame.SRCALPHA)
         ctrl_panel.fill((20, 40, 30, 230))
         pygame.draw.rect(ctrl_panel, (60, 120, 80, 255), (0, 0, ctrl_width, ctrl_height), border_radius=16)
-        font_ctrl = get_font(32)
-        ctrl_title = font_ctrl.render("Controls", True, (255,255,200))
+        ctrl_title = render_text("Controls", 32, (255,255,200))
         ctrl_panel.blit(ctrl_title, (ctrl_width//2 - ctrl_title.get_width()//2, 20))
         # Updated controls list
         controls = [
@@ -69,66 +69,229 @@ def draw_game_menu(screen, selected=None, show_controls=False):
             "Place/Remove Marker: C (near planet)",
             "Follow Compass/Panel to Marker"
         ]
-        font_small = get_font(22)
         for i, line in enumerate(controls):
-            surf = font_small.render(line, True, (220,255,220))
+            surf = render_text(line, 22, (220,255,220))
             ctrl_panel.blit(surf, (24, 64 + i*28))
-        screen.blit(ctrl_panel, (ctrl_x, ctrl_y))
-    return btn_rects
+        _menu_panels[key] = ctrl_panel
+    return ctrl_panel
 
-def draw_quest_bar(screen, current_quest, quests, WIDTH):
-    # Modern quest bar at bottom with rounded corners and subtle shadow
-    bar_h = 54
-    bar_rect = pygame.Rect(18, screen.get_height() - bar_h - 18, WIDTH-36, bar_h)
-    shadow = pygame.Surface((bar_rect.width+8, bar_rect.height+8), pygame.SRCALPHA)
-    pygame.draw.rect(shadow, (0,0,0,80), shadow.get_rect(), border_radius=16)
-    screen.blit(shadow, (bar_rect.x-4, bar_rect.y-4))
-    pygame.draw.rect(screen, (38,44,68), bar_rect, border_radius=16)
-    pygame.draw.rect(screen, (120,180,255), bar_rect, 3, border_radius=16)
-    font = pygame.font.SysFont("Segoe UI", 28, bold=True)
+def draw_game_menu(screen, selected=None, show_controls=False):
+    menu_width, menu_height = 400, 320
+    menu_x = screen.get_width() // 2 - menu_width // 2 - 100
+    menu_y = screen.get_height() // 2 - menu_height // 2
+    menu_panel, btn_rects = _game_menu_panel(selected, menu_width, menu_height)
+    screen.blit(menu_panel, (menu_x, menu_y))
+    # Draw controls panel to the right if needed
+    if show_controls:
+        ctrl_x = menu_x + menu_width + 20
+        ctrl_y = menu_y + 20
+        screen.blit(_controls_panel(340, 320), (ctrl_x, ctrl_y))
+    return [rect.move(menu_x, menu_y) for rect in btn_rects]
+
+def text_screen(lines, size, color, WIDTH, HEIGHT, top, spacing, background=BLACK, title=None):
+    """
+    Renders a static full-screen page of centered lines once; title is (text, size, color, y).
+    """
+    page = pygame.Surface((WIDTH, HEIGHT))
+    page.fill(background)
+    if title:
+        text, title_size, title_color, title_y = title
+        surf = render_text(text, title_size, title_color)
+        page.blit(surf, (WIDTH//2 - surf.get_width()//2, title_y))
+    for i, line in enumerate(lines):
+        surf = render_text(line, size, color)
+        page.blit(surf, (WIDTH//2 - surf.get_width()//2, top + i*spacing))
+    return page
+
+def wait_for_keys(keys, timeout=None):
+    """
+    Blocks on the event queue until one of keys is pressed (returns the key), the timeout in
+    seconds runs out (returns None) or the window is closed (exits). Exposes re-present the
+    current display contents, so callers draw once before waiting.
+    """
+    import sys
+    deadline = None if timeout is None else pygame.time.get_ticks() + int(timeout * 1000)
+    while True:
+        if deadline is None:
+            event = pygame.event.wait()
+        else:
+            remaining = deadline - pygame.time.get_ticks()
+            if remaining <= 0:
+                return None
+            event = pygame.event.wait(remaining)
+        if event.type == pygame.QUIT:
+            pygame.quit()
+            sys.exit()
+        if event.type == pygame.KEYDOWN and event.key in keys:
+            return event.key
+        if event.type in (pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED):
+            pygame.display.flip()
+
+# --- RETAINED-MODE HUD ---
+class HudWidget:
+    """
+    A HUD element that keeps its rendered surface and re-renders only when the value it is
+    bound to changes. render(value) must return a Surface drawn at pos.
+    """
+    def __init__(self, pos, render):
+        self.pos = pos
+        self.render = render
+        self.value = None
+        self.surface = None
+        self.rect = pygame.Rect(pos, (0, 0))
+
+    def update(self, value):
+        """
+        Binds a new value; returns True if the surface was re-rendered.
+        """
+        if self.surface is not None and value == self.value:
+            return False
+        self.value = value
+        self.surface = self.render(value)
+        self.rect = self.surface.get_rect(topleft=self.pos)
+        return True
+
+    def draw(self, screen):
+        return screen.blit(self.surface, self.pos)
+
+def quest_bar_value(current_quest, quests):
     if current_quest < len(quests):
         quest = quests[current_quest]
-        text = f"Quest: Collect {quest['amount']} {quest['material']} from {quest['planet']} ({quest['collected']}/{quest['amount']})"
-        surf = font.render(text, True, (255,255,255))
-        screen.blit(surf, (bar_rect.x+24, bar_rect.y+12))
-    else:
-        surf = font.render("All quests complete!", True, (180,255,180))
-        screen.blit(surf, (bar_rect.x+24, bar_rect.y+12))
+        return f"Quest: Collect {quest.amount} {quest.material} from {quest.planet} ({quest.collected}/{quest.amount})", (255,255,255)
+    return "All quests complete!", (180,255,180)
 
-def draw_health_fuel_bars(screen, health, max_health, fuel, max_fuel):
+def quest_bar_widget(WIDTH, HEIGHT):
+    # Modern quest bar at bottom with rounded corners and subtle shadow
+    bar_h = 54
+    def render(value):
+        text, color = value
+        surf = pygame.Surface((WIDTH-28, bar_h+8), pygame.SRCALPHA)
+        pygame.draw.rect(surf, (0,0,0,80), surf.get_rect(), border_radius=16)
+        bar_rect = pygame.Rect(4, 4, WIDTH-36, bar_h)
+        pygame.draw.rect(surf, (38,44,68), bar_rect, border_radius=16)
+        pygame.draw.rect(surf, (120,180,255), bar_rect, 3, border_radius=16)
+        surf.blit(render_text(text, 28, color, "Segoe UI", bold=True), (bar_rect.x+24, bar_rect.y+12))
+        return surf
+    return HudWidget((14, HEIGHT - bar_h - 22), render)
+
+_bar_gradients = {}
+
+def _bar_gradient(bar_w, bar_h, kind):
+    # Full-width vertical gradient per bar kind; partial bars blit a slice of it
+    key = (kind, bar_w, bar_h)
+    grad = _bar_gradients.get(key)
+    if grad is None:
+        grad = pygame.Surface((bar_w, bar_h))
+        for i in range(bar_h):
+            c = (120,255-2*i,120) if kind == "health" else (120,180,255-2*i)
+            pygame.draw.line(grad, c, (0,i), (bar_w,i))
+        _bar_gradients[key] = grad
+    return grad
+
+def status_bars_widget(WIDTH):
     # Modern health/fuel bars at top right with icons and gradients
     bar_w, bar_h = 180, 20
-    x, y = screen.get_width() - bar_w - 38, 18
-    # Health
-    bg_rect = pygame.Rect(x, y, bar_w, bar_h)
-    pygame.draw.rect(screen, (60,80,120), bg_rect, border_radius=10)
-    grad = pygame.Surface((int(bar_w*health/max_health), bar_h))
-    for i in range(bar_h):
-        c = (120,255-2*i,120)
-        pygame.draw.line(grad, c, (0,i), (grad.get_width(),i))
-    screen.blit(grad, (x, y))
-    pygame.draw.rect(screen, (120,255,120), (x, y, int(bar_w*health/max_health), bar_h), 2, border_radius=10)
-    font = pygame.font.SysFont("Segoe UI", 20)
-    htxt = font.render(f"HP", True, (0,0,0))
-    screen.blit(htxt, (x-32, y+1))
-    # Fuel
-    y += bar_h + 12
-    bg_rect = pygame.Rect(x, y, bar_w, bar_h)
-    pygame.draw.rect(screen, (60,80,120), bg_rect, border_radius=10)
-    grad = pygame.Surface((int(bar_w*fuel/max_fuel), bar_h))
-    for i in range(bar_h):
-        c = (120,180,255-2*i)
-        pygame.draw.line(grad, c, (0,i), (grad.get_width(),i))
-    screen.blit(grad, (x, y))
-    pygame.draw.rect(screen, (120,180,255), (x, y, int(bar_w*fuel/max_fuel), bar_h), 2, border_radius=10)
-    ftxt = font.render(f"Fuel", True, (0,0,0))
-    screen.blit(ftxt, (x-48, y+1))
+    label_w = 48
+    def render(value):
+        health, max_health, fuel, max_fuel = value
+        surf = pygame.Surface((bar_w + label_w, bar_h*2 + 12), pygame.SRCALPHA)
+        y = 0
+        for kind, amount, maximum, edge, label in (("health", health, max_health, (120,255,120), "HP"),
+                                                   ("fuel", fuel, max_fuel, (120,180,255), "Fuel")):
+            x = label_w
+            pygame.draw.rect(surf, (60,80,120), (x, y, bar_w, bar_h), border_radius=10)
+            fill_w = int(bar_w*amount/maximum)
+            surf.blit(_bar_gradient(bar_w, bar_h, kind), (x, y), (0, 0, fill_w, bar_h))
+            pygame.draw.rect(surf, edge, (x, y, fill_w, bar_h), 2, border_radius=10)
+            txt = render_text(label, 20, (0,0,0), "Segoe UI")
+            surf.blit(txt, (x - (32 if label == "HP" else 48), y+1))
+            y += bar_h + 12
+        return surf
+    return HudWidget((WIDTH - bar_w - 38 - label_w, 18), render)
+
+def marker_panel_widget(WIDTH):
+    # Marker info panel at top right; value is (planet name, rounded distance) or None
+    panel_w, panel_h = 260, 80
+    def render(value):
+        surf = pygame.Surface((panel_w, panel_h), pygame.SRCALPHA)
+        pygame.draw.rect(surf, (38,44,68), (0, 0, panel_w, panel_h), border_radius=16)
+        pygame.draw.rect(surf, (120,180,255), (0, 0, panel_w, panel_h), 3, border_radius=16)
+        if value:
+            name, dist = value
+            surf.blit(render_text(f"Marker: {name}", 26, (255,255,0)), (18, 16))
+            surf.blit(render_text(f"Distance: {dist}", 26, (200,220,255)), (18, 44))
+        else:
+            surf.blit(render_text("No marker set.", 26, (180,200,220)), (18, 28))
+        return surf
+    return HudWidget((WIDTH - panel_w - 24, 18), render)
+
+def compass_widget(WIDTH):
+    # Compass at top center; value is (planet name, arrow tip, angle, distance) or None
+    compass_radius = 60
+    surf_w, surf_h = 240, 180
+    cx, cy = surf_w//2, 60
+    dial = pygame.Surface((surf_w, surf_h), pygame.SRCALPHA)
+    pygame.draw.circle(dial, (60,60,80), (cx, cy), compass_radius, 0)
+    pygame.draw.circle(dial, (120,180,255), (cx, cy), compass_radius, 3)
+    # Draw N/E/S/W
+    for ang, label in zip([0, math.pi/2, math.pi, 3*math.pi/2], ['N','E','S','W']):
+        lx = int(cx + compass_radius * 0.8 * math.sin(ang))
+        ly = int(cy - compass_radius * 0.8 * math.cos(ang))
+        surf = render_text(label, 22, (200,200,255))
+        dial.blit(surf, (lx - surf.get_width()//2, ly - surf.get_height()//2))
+    def render(value):
+        surf = dial.copy()
+        if value:
+            name, (ax, ay), angle, dist = value
+            ax, ay = ax + cx, ay + cy
+            pygame.draw.line(surf, (255,255,0), (cx, cy), (ax, ay), 5)
+            # Draw marker planet name
+            name_surf = render_text(name, 22, (255,255,0))
+            surf.blit(name_surf, (cx - name_surf.get_width()//2, cy + compass_radius + 8))
+            # Draw a small arrow at the tip for clarity
+            perp_angle = angle + math.pi/2
+            left = (int(ax - 10*math.sin(angle) + 6*math.sin(perp_angle)), int(ay + 10*math.cos(angle) + 6*math.cos(perp_angle)))
+            right = (int(ax - 10*math.sin(angle) - 6*math.sin(perp_angle)), int(ay + 10*math.cos(angle) - 6*math.cos(perp_angle)))
+            pygame.draw.polygon(surf, (255,255,0), [(ax, ay), left, right])
+            # Show distance to marker below compass
+            dist_surf = render_text(f"{dist} units", 22, (255,255,0))
+            surf.blit(dist_surf, (cx - dist_surf.get_width()//2, cy + compass_radius + 28))
+        return surf
+    return HudWidget((WIDTH//2 - cx, 0), render)
+
+def compass_value(name, dx, dy, compass_radius=60):
+    """
+    Compass binding for a marker at offset (dx, dy) from the player. The arrow tip is rounded
+    to whole pixels, so the compass only re-renders when the arrow visibly moves.
+    """
+    angle = math.atan2(dx, -dy)
+    arrow_len = compass_radius * 0.7
+    tip = (int(arrow_len * math.sin(angle)), int(-arrow_len * math.cos(angle)))
+    return name, tip, math.atan2(tip[0], -tip[1]), int(math.hypot(dx, dy))
+
+# Shared widgets behind the immediate-mode draw_* helpers, keyed by layout
+_hud_widgets = {}
+
+def _shared_widget(key, factory, *args):
+    widget = _hud_widgets.get(key)
+    if widget is None:
+        widget = _hud_widgets[key] = factory(*args)
+    return widget
+
+def draw_quest_bar(screen, current_quest, quests, WIDTH):
+    widget = _shared_widget(("quest", WIDTH, screen.get_height()), quest_bar_widget, WIDTH, screen.get_height())
+    widget.update(quest_bar_value(current_quest, quests))
+    return widget.draw(screen)
+
+def draw_health_fuel_bars(screen, health, max_health, fuel, max_fuel):
+    widget = _shared_widget(("status", screen.get_width()), status_bars_widget, screen.get_width())
+    widget.update((health, max_health, fuel, max_fuel))
+    return widget.draw(screen)
 
 def draw_menu(screen, menu_open):
     if menu_open:
         pygame.draw.rect(screen, (30,30,30), (200, 100, 400, 400))
-        font = get_font(36)
-        text = font.render("Game Menu", True, WHITE)
+        text = render_text("Game Menu", 36, WHITE)
         screen.blit(text, (320, 120))
         # Add more menu items as needed
 
@@ -139,8 +302,7 @@ def draw_tech_tree_button(screen, WIDTH):
     screen.blit(shadow, (tech_btn_rect.x-3, tech_btn_rect.y-3))
     pygame.draw.rect(screen, (60,120,200), tech_btn_rect, border_radius=12)
     pygame.draw.rect(screen, (120,180,255), tech_btn_rect, 2, border_radius=12)
-    font = get_font(26)
-    tech_surf = font.render("Tech Tree", True, (255,255,255))
+    tech_surf = render_text("Tech Tree", 26, (255,255,255))
     screen.blit(tech_surf, (tech_btn_rect.x + tech_btn_rect.width//2 - tech_surf.get_width()//2, tech_btn_rect.y + tech_btn_rect.height//2 - tech_surf.get_height()//2))
     return tech_btn_rect
 
@@ -152,11 +314,9 @@ def draw_tech_tree(screen, WIDTH, HEIGHT, tech_tree_state, upgrades, unlock_call
     panel = pygame.Surface((panel_width, panel_height), pygame.SRCALPHA)
     panel.fill((30, 30, 60, 240))
     pygame.draw.rect(panel, (80, 120, 200, 255), (0, 0, panel_width, panel_height), border_radius=18)
-    font = get_font(36)
-    title = font.render("Tech Tree", True, (255,255,255))
+    title = render_text("Tech Tree", 36, (255,255,255))
     panel.blit(title, (panel_width//2 - title.get_width()//2, 18))
     # Draw upgrades as buttons
-    font_btn = get_font(26)
     btn_w, btn_h = 150, 54
     btn_gap = 24
     btns = []
@@ -169,85 +329,78 @@ def draw_tech_tree(screen, WIDTH, HEIGHT, tech_tree_state, upgrades, unlock_call
         color = (120, 220, 120) if unlocked else (120, 180, 255)
         pygame.draw.rect(panel, color, btn_rect, border_radius=12)
         # Upgrade name and level
-        upg_txt = font_btn.render(f"{upg} (Lv{data['level']})", True, (30,30,30))
+        upg_txt = render_text(f"{upg} (Lv{data['level']})", 26, (30,30,30))
         panel.blit(upg_txt, (bx + 12, by + 6))
         # Description
-        desc_font = get_font(18)
-        desc = desc_font.render(data['desc'], True, (40,40,40))
+        desc = render_text(data['desc'], 18, (40,40,40))
         panel.blit(desc, (bx + 12, by + 32))
         btns.append((btn_rect.move(panel_x, panel_y), upg))
     # Footer
-    font_footer = get_font(20)
-    close = font_footer.render("Press ESC to close | Click upgrade to unlock", True, (180,200,220))
+    close = render_text("Press ESC to close | Click upgrade to unlock", 20, (180,200,220))
     panel.blit(close, (panel_width//2 - close.get_width()//2, panel_height - 38))
     screen.blit(panel, (panel_x, panel_y))
     return btns
 
 def draw_buttons(screen, buttons):
-    font = get_font(22)
     for btn in buttons:
         pygame.draw.rect(screen, btn['color'], btn['rect'])
-        text = font.render(btn['label'], True, BLACK)
+        text = render_text(btn['label'], 22, BLACK)
         screen.blit(text, (btn['rect'].x+10, btn['rect'].y+5))
 
-def show_cutscene(screen, WIDTH, HEIGHT):
-    import pygame, sys
+def show_cutscene(screen, WIDTH, HEIGHT, on_shown=None):
+    # Drawn once, then the loop sleeps in the event queue until a key or the timer ends it.
+    # on_shown is called right after the first present, e.g. to measure time to first frame
     cutscene_duration = 5.5  # seconds
-    start_time = pygame.time.get_ticks()
-    font = get_font(38)
-    font_small = get_font(28)
-    lines = [
-        "You are Errin, a pioneer of the Galactic Expansion Fleet.",
-        "Your mission: travel to distant planets, colonize them,",
-        "and extract their resources for humanity's future.",
-        "Each world holds unique materials vital for Earth's survival",
-        "and the growth of the new colonies.",
-        "Explore, land, and exploit the riches of the solar system.",
-        "The fate of civilization rests on your success!"
-    ]
-    prompt = "Press SPACE or ENTER to continue..."
-    while True:
-        screen.fill((10, 10, 30))
+    key = ("cutscene", WIDTH, HEIGHT)
+    page = _menu_panels.get(key)
+    if page is None:
+        lines = [
+            "You are Errin, a pioneer of the Galactic Expansion Fleet.",
+            "Your mission: travel to distant planets, colonize them,",
+            "and extract their resources for humanity's future.",
+            "Each world holds unique materials vital for Earth's survival",
+            "and the growth of the new colonies.",
+            "Explore, land, and exploit the riches of the solar system.",
+            "The fate of civilization rests on your success!"
+        ]
+        prompt = "Press SPACE or ENTER to continue..."
+        page = pygame.Surface((WIDTH, HEIGHT))
+        page.fill((10, 10, 30))
         panel = pygame.Surface((WIDTH-80, HEIGHT-120), pygame.SRCALPHA)
         panel.fill((30, 30, 60, 230))
-        screen.blit(panel, (40, 60))
+        page.blit(panel, (40, 60))
         for i, line in enumerate(lines):
-            surf = font.render(line, True, (220, 220, 255))
-            screen.blit(surf, (WIDTH//2 - surf.get_width()//2, 120 + i*48))
-        prompt_surf = font_small.render(prompt, True, (255,255,180))
-        screen.blit(prompt_surf, (WIDTH//2 - prompt_surf.get_width()//2, HEIGHT-100))
-        pygame.display.flip()
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                pygame.quit()
-                sys.exit()
-            if event.type == pygame.KEYDOWN:
-                if event.key in (pygame.K_SPACE, pygame.K_RETURN):
-                    return
-        if (pygame.time.get_ticks() - start_time) > cutscene_duration * 1000:
-            return
+            surf = render_text(line, 38, (220, 220, 255))
+            page.blit(surf, (WIDTH//2 - surf.get_width()//2, 120 + i*48))
+        prompt_surf = render_text(prompt, 28, (255,255,180))
+        page.blit(prompt_surf, (WIDTH//2 - prompt_surf.get_width()//2, HEIGHT-100))
+        _menu_panels[key] = page
+    screen.blit(page, (0, 0))
+    pygame.display.flip()
+    if on_shown is not None:
+        on_shown()
+    wait_for_keys((pygame.K_SPACE, pygame.K_RETURN), cutscene_duration)
 
 def draw_base_buttons(screen, HEIGHT, landed_planet, base_on_planet):
     build_btn_rect = None
     upgrade_base_btn_rect = None
     upgrade_ship_btn_rect = None
-    font_btn = get_font(28)
     btn_y = HEIGHT - 110
     if landed_planet:
-        pname = landed_planet['name']
+        pname = landed_planet.name
         if not base_on_planet:
             build_btn_rect = pygame.Rect(40, btn_y, 180, 44)
             pygame.draw.rect(screen, (60,200,100), build_btn_rect, border_radius=10)
-            build_txt = font_btn.render("Build Base", True, (255,255,255))
+            build_txt = render_text("Build Base", 28, (255,255,255))
             screen.blit(build_txt, (build_btn_rect.x + 20, build_btn_rect.y + 8))
         else:
             upgrade_base_btn_rect = pygame.Rect(40, btn_y, 180, 44)
             pygame.draw.rect(screen, (200,180,60), upgrade_base_btn_rect, border_radius=10)
-            upg_txt = font_btn.render("Upgrade Base", True, (255,255,255))
+            upg_txt = render_text("Upgrade Base", 28, (255,255,255))
             screen.blit(upg_txt, (upgrade_base_btn_rect.x + 10, upgrade_base_btn_rect.y + 8))
         upgrade_ship_btn_rect = pygame.Rect(240, btn_y, 180, 44)
         pygame.draw.rect(screen, (80,120,220), upgrade_ship_btn_rect, border_radius=10)
-        ship_txt = font_btn.render("Upgrade Ship", True, (255,255,255))
+        ship_txt = render_text("Upgrade Ship", 28, (255,255,255))
         screen.blit(ship_txt, (upgrade_ship_btn_rect.x + 10, upgrade_ship_btn_rect.y + 8))
     return build_btn_rect, upgrade_base_btn_rect, upgrade_ship_btn_rect
 
@@ -263,28 +416,25 @@ def draw_inventory(screen, inventory, WIDTH, HEIGHT, scroll_offset=0):
     pygame.draw.rect(screen, (38, 44, 68), (modal_x, modal_y, modal_w, modal_h), border_radius=22)
     pygame.draw.rect(screen, (120, 180, 255), (modal_x, modal_y, modal_w, modal_h), 5, border_radius=22)
     # Title
-    font = pygame.font.SysFont("Segoe UI", 48, bold=True)
-    title = font.render("Inventory", True, (255,255,255))
+    title = render_text("Inventory", 48, (255,255,255), "Segoe UI", bold=True)
     screen.blit(title, (modal_x + modal_w//2 - title.get_width()//2, modal_y + 22))
     # Items
-    font = pygame.font.SysFont("Segoe UI", 30)
     # --- Ensure all possible materials are shown if collected at least once ---
     items = [(item, count) for item, count in inventory.items() if count > 0]
     items_per_page = 7
     start = scroll_offset
     end = min(start + items_per_page, len(items))
     if not items:
-        empty = font.render("(Empty)", True, (180,200,220))
+        empty = render_text("(Empty)", 30, (180,200,220), "Segoe UI")
         screen.blit(empty, (modal_x + modal_w//2 - empty.get_width()//2, modal_y + 110))
     else:
         for i, (item, count) in enumerate(items[start:end]):
             line = f"{item}: {count}"
             pygame.draw.rect(screen, (60, 80, 120), (modal_x+36, modal_y+90+i*44, modal_w-72, 38), border_radius=12)
-            surf = font.render(line, True, (220, 240, 255))
+            surf = render_text(line, 30, (220, 240, 255), "Segoe UI")
             screen.blit(surf, (modal_x + 52, modal_y + 96 + i*44))
     # Footer
-    font = pygame.font.SysFont("Segoe UI", 22)
-    close = font.render("Press I or ESC to close | Scroll: Up/Down", True, (180,200,220))
+    close = render_text("Press I or ESC to close | Scroll: Up/Down", 22, (180,200,220), "Segoe UI")
     screen.blit(close, (modal_x + modal_w//2 - close.get_width()//2, modal_y + modal_h - 44))
     # Scroll indicators
     arrow_color = (120, 180, 255)
@@ -301,26 +451,154 @@ def draw_inventory(screen, inventory, WIDTH, HEIGHT, scroll_offset=0):
             (modal_x + modal_w - 32, modal_y + 124 + items_per_page*44)
         ])
 
+# Pre-baked background layers, rebuilt only when the resolution or sun changes
+_background_layers = {}
+
+def _gradient_layer(WIDTH, HEIGHT):
+    key = ("gradient", WIDTH, HEIGHT)
+    layer = _background_layers.get(key)
+    if layer is None:
+        layer = pygame.Surface((WIDTH, HEIGHT))
+        for y in range(HEIGHT):
+            c = int(20 + 30 * (y / HEIGHT))
+            pygame.draw.line(layer, (c, c, 48), (0, y), (WIDTH, y))
+        layer = layer.convert() if pygame.display.get_surface() else layer
+        _background_layers[key] = layer
+    return layer
+
+def _sun_layers(SUN_COLOR, SUN_RADIUS):
+    # Glow rings are accumulated into one additive layer; the disc is a separate alpha layer
+    key = ("sun", tuple(SUN_COLOR), SUN_RADIUS)
+    layers = _background_layers.get(key)
+    if layers is None:
+        outer = SUN_RADIUS + 30
+        glow = pygame.Surface((outer*2, outer*2), pygame.SRCALPHA)
+        for r in range(outer, SUN_RADIUS, -6):
+            alpha = max(0, 80 - (outer-r)*4)
+            ring = pygame.Surface((r*2, r*2), pygame.SRCALPHA)
+            pygame.draw.circle(ring, (*SUN_COLOR, alpha), (r, r), r)
+            glow.blit(ring, (outer-r, outer-r), special_flags=pygame.BLEND_RGBA_ADD)
+        disc = pygame.Surface((SUN_RADIUS*2, SUN_RADIUS*2), pygame.SRCALPHA)
+        pygame.draw.circle(disc, SUN_COLOR, (SUN_RADIUS, SUN_RADIUS), SUN_RADIUS)
+        layers = (glow, disc)
+        _background_layers[key] = layers
+    return layers
+
 def draw_game_background(screen, stars, cam_x, cam_y, WIDTH, HEIGHT, SUN_COLOR, SUN_POS, SUN_RADIUS, WHITE):
     # Draw a subtle gradient background
-    bg = pygame.Surface((WIDTH, HEIGHT))
-    for y in range(HEIGHT):
-        c = int(20 + 30 * (y / HEIGHT))
-        pygame.draw.line(bg, (c, c, 48), (0, y), (WIDTH, y))
-    screen.blit(bg, (0, 0))
+    screen.blit(_gradient_layer(WIDTH, HEIGHT), (0, 0))
     # Draw stars with glow
-    for sx, sy in stars:
-        if cam_x <= sx <= cam_x + WIDTH and cam_y <= sy <= cam_y + HEIGHT:
-            pygame.draw.circle(screen, (255,255,255,40), (sx - cam_x, sy - cam_y), 6)
-            pygame.draw.circle(screen, WHITE, (sx - cam_x, sy - cam_y), 2)
-    # Draw sun with glow
-    sun_pos = (SUN_POS[0] - cam_x, SUN_POS[1] - cam_y)
-    for r in range(SUN_RADIUS+30, SUN_RADIUS, -6):
-        alpha = max(0, 80 - (SUN_RADIUS+30-r)*4)
-        glow = pygame.Surface((r*2, r*2), pygame.SRCALPHA)
-        pygame.draw.circle(glow, (*SUN_COLOR, alpha), (r, r), r)
-        screen.blit(glow, (sun_pos[0]-r, sun_pos[1]-r), special_flags=pygame.BLEND_RGBA_ADD)
-    pygame.draw.circle(screen, SUN_COLOR, sun_pos, SUN_RADIUS)
+    # stars are (x, y, radius) already culled to the camera by StarField.visible
+    for sx, sy, radius in stars:
+        if radius > 2:
+            pygame.draw.circle(screen, (255,255,255,40), (sx - cam_x, sy - cam_y), radius)
+        pygame.draw.circle(screen, WHITE, (sx - cam_x, sy - cam_y), min(radius, 2))
+    # Draw sun with glow, skipped entirely when off-screen
+    draw_star(screen, SUN_POS, SUN_COLOR, SUN_RADIUS, cam_x, cam_y, WIDTH, HEIGHT)
+
+def draw_star(screen, star_pos, color, radius, cam_x, cam_y, WIDTH, HEIGHT):
+    sun_pos = (star_pos[0] - cam_x, star_pos[1] - cam_y)
+    outer = radius + 30
+    if -outer < sun_pos[0] < WIDTH + outer and -outer < sun_pos[1] < HEIGHT + outer:
+        glow, disc = _sun_layers(color, radius)
+        screen.blit(glow, (sun_pos[0]-outer, sun_pos[1]-outer), special_flags=pygame.BLEND_RGBA_ADD)
+        screen.blit(disc, (sun_pos[0]-radius, sun_pos[1]-radius))
+
+def build_planet_sprites(planet_data):
+    """
+    Bakes the glow, body and name label of every planet once, keyed by planet name.
+    bounds is the sprite's extent relative to the planet center, used for culling.
+    """
+    sprites = {}
+    for p in planet_data:
+        pr = p["size"]
+        outer = pr + 18
+        glow = pygame.Surface((outer*2, outer*2), pygame.SRCALPHA)
+        for r in range(outer, pr, -4):
+            alpha = max(0, 60 - (outer-r)*4)
+            ring = pygame.Surface((r*2, r*2), pygame.SRCALPHA)
+            pygame.draw.circle(ring, (*p["color"], alpha), (r, r), r)
+            glow.blit(ring, (outer-r, outer-r), special_flags=pygame.BLEND_RGBA_ADD)
+        body = pygame.Surface((pr*2, pr*2), pygame.SRCALPHA)
+        pygame.draw.circle(body, p["color"], (pr, pr), pr)
+        # Name is drawn twice, one pixel apart, for a heavier look
+        name_surf = render_text(p["name"], 24, WHITE)
+        label = pygame.Surface((name_surf.get_width()+1, name_surf.get_height()+1), pygame.SRCALPHA)
+        label.blit(name_surf, (1, 1))
+        label.blit(name_surf, (0, 0))
+        label_pos = (-pr - 30, -pr - 30)
+        bounds = pygame.Rect(-outer, -outer, outer*2, outer*2).union(pygame.Rect(label_pos, label.get_size()))
+        sprites[p["name"]] = {"glow": glow, "body": body, "label": label, "label_pos": label_pos, "bounds": bounds}
+    return sprites
+
+def build_entity_sprites(ship_img, trader_size=24):
+    """
+    Sprites for entities.draw, indexed by entities.SPRITE_*: a small tinted ship for traders
+    (rotated through a RotationCache) and a plain glowing dot for shots.
+    """
+    if ship_img is not None:
+        name = "trader"
+        trader = pygame.transform.smoothscale(ship_img, (trader_size, trader_size))
+        trader.fill((150, 200, 255, 255), special_flags=pygame.BLEND_RGBA_MULT)
+    else:
+        name = "trader-outline"  # Own cache key, so loading the ship later replaces it
+        trader = pygame.Surface((trader_size, trader_size), pygame.SRCALPHA)
+        pygame.draw.polygon(trader, (150, 200, 255), [(trader_size // 2, 0), (0, trader_size - 1), (trader_size - 1, trader_size - 1)])
+    shot = pygame.Surface((6, 6), pygame.SRCALPHA)
+    pygame.draw.circle(shot, (255, 160, 60, 120), (3, 3), 3)
+    pygame.draw.circle(shot, (255, 240, 200), (3, 3), 1)
+    return [get_rotation_cache(name, trader, shadow=False), shot]
+
+def draw_planets(screen, planets, sprites, cam_x, cam_y, WIDTH, HEIGHT, rects=None):
+    # Only planets whose sprite bounds intersect the camera are drawn; their screen bounds go to rects
+    view = pygame.Rect(cam_x, cam_y, WIDTH, HEIGHT)
+    drawn = 0
+    for planet in planets:
+        sprite = sprites[planet.name]
+        px, py = planet.pos
+        bounds = sprite["bounds"]
+        if not view.colliderect(bounds.move(int(px), int(py))):
+            continue
+        sx, sy = int(px - cam_x), int(py - cam_y)
+        glow, body = sprite["glow"], sprite["body"]
+        screen.blit(glow, (sx - glow.get_width()//2, sy - glow.get_height()//2), special_flags=pygame.BLEND_RGBA_ADD)
+        screen.blit(body, (sx - body.get_width()//2, sy - body.get_height()//2))
+        lx, ly = sprite["label_pos"]
+        screen.blit(sprite["label"], (sx + lx, sy + ly))
+        if rects is not None:
+            rects.append(bounds.move(sx, sy))
+        drawn += 1
+    return drawn
+
+# Profiler overlay: the stats table is refreshed every few frames, the graph every frame
+_profiler_overlay = {"frame": 0, "lines": []}
+
+def draw_profiler_overlay(screen, profiler, refresh_every=15):
+    frame_times = profiler.frame_times()
+    graph_w, graph_h = 240, 60
+    x, y = 10, screen.get_height() - graph_h - 100
+    panel = pygame.Surface((graph_w + 20, graph_h + 20), pygame.SRCALPHA)
+    panel.fill((0, 0, 0, 160))
+    screen.blit(panel, (x - 10, y - 10))
+    # 16.7 ms (60 FPS) and 33.3 ms (30 FPS) guides; the graph tops out at 50 ms
+    for budget, color in ((16.7, (80, 200, 80)), (33.3, (200, 160, 60))):
+        gy = y + graph_h - int(graph_h * budget / 50.0)
+        pygame.draw.line(screen, color, (x, gy), (x + graph_w, gy), 1)
+    recent = frame_times[-graph_w:]
+    if len(recent) > 1:
+        points = [(x + i, y + graph_h - int(graph_h * min(ms, 50.0) / 50.0)) for i, ms in enumerate(recent)]
+        pygame.draw.lines(screen, (255, 255, 255), False, points, 1)
+    state = _profiler_overlay
+    state["frame"] += 1
+    if state["frame"] % refresh_every == 1 or not state["lines"]:
+        stats = profiler.stats()
+        state["lines"] = [f"{name:<11} p50 {s['p50']:5.2f}  p95 {s['p95']:5.2f}  p99 {s['p99']:5.2f} ms"
+                          for name, s in sorted(stats.items(), key=lambda item: -item[1]["p50"])]
+    ty = 10
+    for line in state["lines"]:
+        surf = render_text(line, 18, (220, 255, 220))
+        screen.blit(surf, (10, ty))
+        ty += 16
 
 # Remove spaceship image loading from ui.py, move to assets.py for proper modularity
 
@@ -0,0 +1,177 @@
+"""
+Seeded procedural star systems beyond the home system.
+
+Space is cut into square sectors centered on the home sun; sector (0, 0) is the hand-made
+home system and every other sector may hold one generated system. A system is a pure
+function of (seed, sector), so systems are generated only when the player comes near,
+evicted from a bounded LRU, and regenerate identically when revisited. The only state kept
+for evicted systems is quest progress, one small entry per system with progress.
+"""
+
+import math
+import random
+from collections import OrderedDict
+import gamelog
+from assets import SUN_POS
+from planets import PlanetTable
+from game import Quest
+
+SECTOR_SIZE = 30000   # World units per sector side
+SYSTEM_CHANCE = 0.7   # Chance that a sector holds a system
+MAX_SYSTEMS = 32      # Resident systems; the 3x3 sectors around the player always fit
+ACTIVE_MARGIN = 3000  # Bodies are simulated once the player is this close to a system's extent
+
+# Star types: (color, radius); a small fixed palette keeps the baked sun layers bounded
+STAR_TYPES = [
+    ((255, 255, 100), 150),
+    ((255, 200, 120), 120),
+    ((255, 140, 90), 100),
+    ((200, 220, 255), 170),
+    ((255, 240, 220), 140),
+]
+_SYLLABLES = ["ka", "ri", "on", "ve", "lu", "xa", "tor", "mi", "sel", "dra", "no", "phe", "zu", "gan", "thi", "or"]
+_MATERIAL_PREFIXES = ["Cryo", "Pyro", "Neo", "Quantum", "Void", "Lumen", "Ferro", "Helio", "Aether", "Plasma"]
+_MATERIAL_SUFFIXES = ["nite", "ium", " Gel", " Dust", " Ice", " Crystal", " Ore", "lite"]
+
+quest_log = gamelog.get_logger("quest")
+
+
+def _name(rng, syllables):
+    return "".join(rng.choice(_SYLLABLES) for _ in range(syllables)).capitalize()
+
+
+def sector_of(x, y, sector_size=SECTOR_SIZE):
+    return (math.floor((x - SUN_POS[0]) / sector_size + 0.5),
+            math.floor((y - SUN_POS[1]) / sector_size + 0.5))
+
+
+class StarSystem:
+    """
+    One generated system: a star, planets in the PLANETS schema and quests in the QUESTS
+    schema (as game.Quest records), with each quest asking for the material of one of the system's planets.
+    """
+    def __init__(self, seed, sector, sector_size=SECTOR_SIZE):
+        rng = random.Random((seed * 1000003) ^ (sector[0] * 73856093) ^ (sector[1] * 19349663))
+        self.sector = sector
+        self.exists = rng.random() < SYSTEM_CHANCE
+        if not self.exists:
+            return
+        self.name = _name(rng, rng.randint(2, 3))
+        self.star_color, self.star_radius = rng.choice(STAR_TYPES)
+        # Orbits grow outwards from the star, and the whole system fits inside its sector
+        self.planets = []
+        orbit = self.star_radius + rng.randint(400, 900)
+        limit = sector_size // 2 - ACTIVE_MARGIN
+        materials = []
+        for i in range(rng.randint(3, 7)):
+            size = rng.randint(30, 110)
+            if orbit + size > limit:
+                break
+            material = rng.choice(_MATERIAL_PREFIXES) + rng.choice(_MATERIAL_SUFFIXES)
+            materials.append(material)
+            self.planets.append({
+                "name": f"{self.name} {'bcdefgh'[i]}",
+                "orbit_radius": orbit,
+                "color": (rng.randint(60, 255), rng.randint(60, 255), rng.randint(60, 255)),
+                "material": material,
+                "size": size,
+                "speed": round(rng.uniform(0.05, 1.2) * 600 / orbit, 3),
+                "angle": rng.uniform(0, 2 * math.pi),
+            })
+            orbit += rng.randint(500, 1400)
+        self.extent = max((p["orbit_radius"] + p["size"] for p in self.planets), default=self.star_radius)
+        slack = max(0, limit - self.extent)
+        cx = SUN_POS[0] + sector[0] * sector_size
+        cy = SUN_POS[1] + sector[1] * sector_size
+        self.star_pos = (cx + rng.randint(-slack, slack), cy + rng.randint(-slack, slack))
+        self.quests = []
+        for planet in self.planets:
+            amount = rng.randint(2, 4)
+            self.quests.append(Quest(
+                desc=f"Collect {amount} {planet['material']} from {planet['name']}.",
+                planet=planet["name"], material=planet["material"], amount=amount,
+                collected=0, completed=False, reward={"fuel": 10},
+            ))
+        self.table = PlanetTable(self.planets)
+        # Render-only resources, created on first draw and dropped with the system
+        self.render_table = None
+        self.sprites = None
+
+    def active_quest(self):
+        for i, quest in enumerate(self.quests):
+            if not quest.completed:
+                return i
+        return None
+
+
+class Universe:
+    """
+    Bounded LRU of generated systems around the player, plus per-system quest progress.
+    """
+    def __init__(self, seed=0, sector_size=SECTOR_SIZE, max_systems=MAX_SYSTEMS):
+        self.seed = seed
+        self.sector_size = sector_size
+        self.max_systems = max(max_systems, 9)
+        self.progress = {}  # sector -> [(collected, completed), ...] for systems with progress
+        self.generated = 0
+        self._systems = OrderedDict()
+
+    def __len__(self):
+        return len(self._systems)
+
+    def system(self, sector):
+        """
+        The system in a sector, or None if the sector is empty (or is the home sector).
+        """
+        if sector == (0, 0):
+            return None
+        system = self._systems.get(sector)
+        if system is None:
+            system = StarSystem(self.seed, sector, self.sector_size)
+            self.generated += 1
+            saved = self.progress.get(sector)
+            if saved and system.exists:
+                for quest, (collected, completed) in zip(system.quests, saved):
+                    quest.collected = collected
+                    quest.completed = completed
+            self._systems[sector] = system
+            if len(self._systems) > self.max_systems:
+                self._systems.popitem(last=False)
+        else:
+            self._systems.move_to_end(sector)
+        return system if system.exists else None
+
+    def nearby(self, x, y):
+        # The player's sector and its 8 neighbours, generated on demand
+        sx, sy = sector_of(x, y, self.sector_size)
+        systems = []
+        for dy in (-1, 0, 1):
+            for dx in (-1, 0, 1):
+                system = self.system((sx + dx, sy + dy))
+                if system is not None:
+                    systems.append(system)
+        return systems
+
+    def active(self, x, y, margin=ACTIVE_MARGIN):
+        """
+        Nearby systems whose extent, grown by margin, contains (x, y).
+        """
+        return [s for s in self.nearby(x, y)
+                if math.hypot(x - s.star_pos[0], y - s.star_pos[1]) < s.extent + margin]
+
+    def collect(self, system, planet, material, amount=1):
+        """
+        Adds progress to the system's active quest if it targets this planet and material.
+        """
+        idx = system.active_quest()
+        if idx is None:
+            return False
+        quest = system.quests[idx]
+        if quest.planet != planet or quest.material != material:
+            return False
+        quest.collected = min(quest.amount, quest.collected + amount)
+        if quest.collected >= quest.amount:
+            quest.completed = True
+            quest_log.info("Quest completed for %s (%s) in %s", planet, material, system.name)
+        self.progress[system.sector] = [(q.collected, q.completed) for q in system.quests]
+        return True